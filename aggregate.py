@@ -0,0 +1,117 @@
+"""Инкрементальная агрегация результатов тренировок по спортсменам."""
+
+from typing import Dict, Iterable, List, Tuple
+
+from homework import InfoMessage
+
+METRICS: Tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+
+Key = Tuple[str, str]  # (спортсмен, тип тренировки)
+
+
+class Moments:
+    """Количество, сумма, среднее и дисперсия потока чисел (Уэлфорд)."""
+    __slots__ = ('count', 'total', 'mean', 'm2')
+
+    def __init__(self, count: int = 0, total: float = 0.0,
+                 mean: float = 0.0, m2: float = 0.0) -> None:
+        self.count: int = count
+        self.total: float = total
+        self.mean: float = mean
+        self.m2: float = m2  # сумма квадратов отклонений от среднего
+
+    def add(self, value: float) -> None:
+        """Учесть одно значение."""
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: 'Moments') -> None:
+        """Объединить с частичным результатом другого обработчика (Чан)."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.total += other.total
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Выборочная дисперсия (0 при одном значении)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def as_list(self) -> list:
+        return [self.count, self.total, self.mean, self.m2]
+
+
+class Aggregator:
+    """Накопительные итоги по ключу (спортсмен, тип тренировки).
+
+    Память — O(1) на ключ: для каждой метрики хранятся только количество,
+    сумма, среднее и сумма квадратов отклонений.
+    """
+
+    def __init__(self) -> None:
+        self._groups: Dict[Key, Dict[str, Moments]] = {}
+
+    def _group(self, key: Key) -> Dict[str, Moments]:
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {name: Moments() for name in METRICS}
+        return group
+
+    def add(self, info: InfoMessage, athlete: str = '') -> None:
+        """Учесть результат одной тренировки."""
+        group = self._group((athlete, info.training_type))
+        group['duration'].add(info.duration)
+        group['distance'].add(info.distance)
+        group['speed'].add(info.speed)
+        group['calories'].add(info.calories)
+
+    def update(self, messages: Iterable[InfoMessage],
+               athlete: str = '') -> None:
+        """Учесть результаты нескольких тренировок одного спортсмена."""
+        for info in messages:
+            self.add(info, athlete)
+
+    def merge(self, other: 'Aggregator') -> None:
+        """Добавить итоги, накопленные другим обработчиком."""
+        for key, other_group in other._groups.items():
+            group = self._group(key)
+            for name in METRICS:
+                group[name].merge(other_group[name])
+
+    def keys(self) -> List[Key]:
+        return sorted(self._groups)
+
+    def totals(self, athlete: str, training_type: str) -> Dict[str, float]:
+        """Итоги по спортсмену и типу тренировки."""
+        group = self._groups[(athlete, training_type)]
+        return {'sessions': group['duration'].count,
+                'duration': group['duration'].total,
+                'distance': group['distance'].total,
+                'calories': group['calories'].total,
+                'mean_speed': group['speed'].mean,
+                'speed_variance': group['speed'].variance,
+                'mean_calories': group['calories'].mean,
+                'calories_variance': group['calories'].variance}
+
+    def snapshot(self) -> list:
+        """Состояние в виде списка, пригодного для JSON."""
+        return [[athlete, training_type,
+                 {name: group[name].as_list() for name in METRICS}]
+                for (athlete, training_type), group
+                in sorted(self._groups.items())]
+
+    @classmethod
+    def restore(cls, snapshot: list) -> 'Aggregator':
+        """Восстановить агрегатор из снимка."""
+        aggregator = cls()
+        for athlete, training_type, group in snapshot:
+            aggregator._groups[(athlete, training_type)] = {
+                name: Moments(*group[name]) for name in METRICS}
+        return aggregator
@@ -0,0 +1,148 @@
+"""Пакетный (векторизованный) расчёт результатов тренировок."""
+
+from array import array
+from typing import Callable, Dict, Mapping, Sequence, Tuple, Type
+
+import numpy as np
+
+from homework import (TRAINING_FIELDS as FIELDS,
+                      TRAINING_TYPES as WORKOUT_CLASSES,
+                      InfoMessage, Training)
+
+Columns = Dict[str, np.ndarray]
+
+
+def distance(cls: Type[Training], col: Columns) -> np.ndarray:
+    """Дистанция в км, как в Training.get_distance."""
+    return col['action'] * cls.LEN_STEP / cls.M_IN_KM
+
+
+def _speed(cls: Type[Training], col: Columns) -> np.ndarray:
+    """Средняя скорость в км/ч, как в Training.get_mean_speed."""
+    return distance(cls, col) / col['duration']
+
+
+def _swimming_speed(cls: Type[Training], col: Columns) -> np.ndarray:
+    """Средняя скорость в км/ч, как в Swimming.get_mean_speed."""
+    metres = col['length_pool'] * col['count_pool']  # дистанция, в м.
+    return metres / cls.M_IN_KM / col['duration']
+
+
+def _running_calories(cls: Type[Training], col: Columns,
+                      speed: np.ndarray) -> np.ndarray:
+    """Калории, как в Running.get_spent_calories."""
+    duration_in_m = col['duration'] * cls.H_IN_M
+    calor = cls.COEFF_CALOR_RUN_1 * speed - cls.COEFF_CALOR_RUN_2
+    return calor * col['weight'] / cls.M_IN_KM * duration_in_m
+
+
+def _walking_calories(cls: Type[Training], col: Columns,
+                      speed: np.ndarray) -> np.ndarray:
+    """Калории, как в SportsWalking.get_spent_calories (с делением нацело)."""
+    duration_in_m = col['duration'] * cls.H_IN_M
+    weight = col['weight']
+    return (cls.COEFF_CALOR_WALK_1
+            * weight
+            + (speed ** cls.COEFF_CALOR_WALK_2 // col['height'])
+            * cls.COEFF_CALOR_WALK_3 * weight) * duration_in_m
+
+
+def _swimming_calories(cls: Type[Training], col: Columns,
+                       speed: np.ndarray) -> np.ndarray:
+    """Калории, как в Swimming.get_spent_calories."""
+    calor = speed + cls.COEFF_CALOR_SWIM_1
+    return calor * cls.COEFF_CALOR_SWIM_2 * col['weight']
+
+
+KERNELS: Dict[str, Tuple[Callable, Callable]] = {
+    'SWM': (_swimming_speed, _swimming_calories),
+    'RUN': (_speed, _running_calories),
+    'WLK': (_speed, _walking_calories),
+}
+
+
+def calculate_batch(workout_type: str,
+                    columns: Mapping[str, Sequence]) -> Columns:
+    """Рассчитать дистанцию, скорость и калории для всех строк сразу."""
+    if workout_type not in KERNELS:
+        raise KeyError('Ошибка! Тип тренировки не определен!')
+    cls = WORKOUT_CLASSES[workout_type]
+    col = {name: np.asarray(columns[name]) for name in FIELDS[workout_type]}
+    speed_kernel, calories_kernel = KERNELS[workout_type]
+    speed = speed_kernel(cls, col)
+    return {'duration': col['duration'],
+            'distance': distance(cls, col),
+            'speed': speed,
+            'calories': calories_kernel(cls, col, speed)}
+
+
+def columns_from_rows(workout_type: str, rows: Sequence[Sequence]) -> Columns:
+    """Разложить строки пакетов одного типа по колонкам."""
+    fields = FIELDS[workout_type]
+    if not rows:
+        return {name: np.empty(0) for name in fields}
+    table = np.asarray(rows, dtype=float)
+    return {name: table[:, i] for i, name in enumerate(fields)}
+
+
+def iter_info_messages(workout_type: str, result: Columns):
+    """Построчно выдать InfoMessage по результатам пакетного расчёта."""
+    training_type = WORKOUT_CLASSES[workout_type].__name__
+    for row in zip(result['duration'].tolist(),
+                   result['distance'].tolist(),
+                   result['speed'].tolist(),
+                   result['calories'].tolist()):
+        yield InfoMessage(training_type, *row)
+
+
+class TrainingBatch:
+    """Тренировки одного типа, хранимые по колонкам (struct of arrays)."""
+    __slots__ = ('workout_type', '_columns')
+
+    def __init__(self, workout_type: str, rows: Sequence[Sequence] = ()
+                 ) -> None:
+        if workout_type not in FIELDS:
+            raise KeyError('Ошибка! Тип тренировки не определен!')
+        self.workout_type: str = workout_type
+        self._columns: Dict[str, array] = {
+            name: array('d') for name in FIELDS[workout_type]}
+        self.extend(rows)
+
+    def append(self, data: Sequence) -> None:
+        """Добавить данные одной тренировки."""
+        if len(data) != len(self._columns):
+            raise ValueError(
+                'Ошибка! Для %s ожидается %d значений, получено %d.'
+                % (self.workout_type, len(self._columns), len(data)))
+        for column, value in zip(self._columns.values(), data):
+            column.append(value)
+
+    def extend(self, rows: Sequence[Sequence]) -> None:
+        """Добавить данные нескольких тренировок."""
+        for data in rows:
+            self.append(data)
+
+    def __len__(self) -> int:
+        return len(self._columns['action'])
+
+    def __getitem__(self, index: int) -> Training:
+        """Восстановить объект тренировки по номеру строки."""
+        row = [column[index] for column in self._columns.values()]
+        return WORKOUT_CLASSES[self.workout_type](*row)
+
+    def columns(self) -> Columns:
+        """Вернуть копию колонок в виде массивов NumPy."""
+        return {name: np.array(column, dtype=float)
+                for name, column in self._columns.items()}
+
+    def calculate(self) -> Columns:
+        """Рассчитать результаты для всех тренировок контейнера."""
+        return calculate_batch(self.workout_type, self.columns())
+
+    def show_training_info(self, index: int) -> InfoMessage:
+        """Вернуть информационное сообщение для одной тренировки."""
+        return self[index].show_training_info()
+
+    def iter_info_messages(self):
+        """Выдать информационные сообщения для всех тренировок."""
+        return iter_info_messages(self.workout_type, self.calculate())
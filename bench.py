@@ -0,0 +1,283 @@
+"""Замеры производительности горячих участков модуля фитнес-трекера."""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from homework import (InfoMessage, Running, SportsWalking, Swimming, Training,
+                      main, read_package)
+from stream import render_packages
+
+BATCH: int = 1000  # операций в одном замере пропускной способности
+SAMPLES: int = 100000  # сколько операций замерять по отдельности
+SIZES: Tuple[int, ...] = (10 ** 3, 10 ** 4, 10 ** 5)
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+# замер: batch -> (операция, список аргументов для каждого вызова)
+Workload = Tuple[Callable[..., object], List[tuple]]
+
+
+def _packages(batch: int) -> list:
+    """Пакеты всех видов спорта вперемешку."""
+    return [PACKAGES[i % len(PACKAGES)] for i in range(batch)]
+
+
+def _trainings(batch: int) -> list:
+    """Готовые объекты тренировок."""
+    return [read_package(*package) for package in _packages(batch)]
+
+
+def bench_read_package(batch: int) -> Workload:
+    return read_package, _packages(batch)
+
+
+def _bench_calories(cls, data: list) -> Callable[[int], Workload]:
+    def factory(batch: int) -> Workload:
+        return cls.get_spent_calories, [(cls(*data),) for _ in range(batch)]
+    return factory
+
+
+def bench_show_training_info(batch: int) -> Workload:
+    return Training.show_training_info, [
+        (training,) for training in _trainings(batch)]
+
+
+def bench_get_message(batch: int) -> Workload:
+    return InfoMessage.get_message, [
+        (training.show_training_info(),) for training in _trainings(batch)]
+
+
+def _main_package(workout_type: str, data: list) -> None:
+    main(read_package(workout_type, data))
+
+
+def bench_main(batch: int) -> Workload:
+    return _main_package, _packages(batch)
+
+
+BENCHMARKS: Dict[str, Callable[[int], Workload]] = {
+    'read_package': bench_read_package,
+    'Running.get_spent_calories': _bench_calories(Running, [15000, 1, 75]),
+    'SportsWalking.get_spent_calories': _bench_calories(
+        SportsWalking, [9000, 1, 75, 180]),
+    'Swimming.get_spent_calories': _bench_calories(
+        Swimming, [720, 1, 80, 25, 40]),
+    'show_training_info': bench_show_training_info,
+    'InfoMessage.get_message': bench_get_message,
+    'main': bench_main,
+}
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Перцентиль q (0..100) по методу ближайшего ранга."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1,
+                       math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _timer_overhead(rounds: int = 1000) -> int:
+    """Минимальная разница двух соседних вызовов perf_counter_ns."""
+    timer = time.perf_counter_ns
+    best = None
+    for _ in range(rounds):
+        begin = timer()
+        spent = timer() - begin
+        if best is None or spent < best:
+            best = spent
+    return best
+
+
+def latencies(workload: Workload, count: int) -> List[float]:
+    """Время каждой из count операций в нс, без накладных расходов таймера."""
+    operation, arguments = workload
+    timer = time.perf_counter_ns
+    overhead = _timer_overhead()
+    result: List[float] = []
+    for i in range(count):
+        args = arguments[i % len(arguments)]
+        begin = timer()
+        operation(*args)
+        result.append(max(0, timer() - begin - overhead))
+    return result
+
+
+def peak_memory(factory: Callable[[int], Workload], size: int) -> int:
+    """Пик памяти при подготовке и обработке size тренировок, в байтах."""
+    tracemalloc.start()
+    try:
+        operation, arguments = factory(size)
+        for args in arguments:
+            operation(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(factory: Callable[[int], Workload], size: int,
+            batch: int = BATCH, memory: bool = True,
+            samples: int = SAMPLES) -> Dict[str, float]:
+    """Выполнить size операций и собрать статистику.
+
+    Пропускная способность считается по size операциям порциями по batch,
+    перцентили задержки — по min(size, samples) отдельно замеренным
+    операциям, пик памяти — по обработке всех size тренировок сразу.
+    """
+    batch = min(batch, size)
+    repeats = max(1, size // batch)
+    workload = factory(batch)
+    operation, arguments = workload
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for args in arguments:
+                operation(*args)
+        elapsed = time.perf_counter() - started
+        timings = latencies(workload, min(size, samples))
+        result = {'operations': repeats * batch,
+                  'seconds': elapsed,
+                  'ops_per_sec': repeats * batch / elapsed,
+                  'samples': len(timings),
+                  'p50_ns': percentile(timings, 50),
+                  'p95_ns': percentile(timings, 95),
+                  'p99_ns': percentile(timings, 99)}
+        if memory:
+            result['peak_bytes'] = peak_memory(factory, size)
+    return result
+
+
+def measure_threads(size: int, threads: Sequence[int],
+                    batch: int = BATCH) -> List[Dict[str, float]]:
+    """Пропускная способность render_packages при разном числе потоков.
+
+    На сборке CPython со свободными потоками (без GIL) ожидается почти
+    линейный рост; с GIL — примерно постоянная пропускная способность.
+    """
+    packages = _packages(min(batch, size))
+    repeats = max(1, size // len(packages))
+    results = []
+    for count in threads:
+        with ThreadPoolExecutor(count) as executor:
+            started = time.perf_counter()
+            for _ in executor.map(render_packages, [packages] * repeats):
+                pass
+            elapsed = time.perf_counter() - started
+        results.append({'threads': count,
+                        'operations': repeats * len(packages),
+                        'ops_per_sec': repeats * len(packages) / elapsed})
+    return results
+
+
+def _gil_enabled() -> bool:
+    """Включён ли GIL в текущем интерпретаторе."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _git_revision() -> Optional[str]:
+    """Текущий коммит репозитория, если он доступен."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(sizes: Sequence[int], names: Sequence[str],
+            batch: int = BATCH, memory: bool = True,
+            samples: int = SAMPLES) -> dict:
+    """Прогнать выбранные замеры на всех размерах."""
+    results = []
+    for name in names:
+        for size in sizes:
+            stats = measure(BENCHMARKS[name], size, batch, memory, samples)
+            results.append(dict(stats, name=name, size=size))
+    return {'revision': _git_revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'timestamp': time.time(),
+            'results': results}
+
+
+def compare(old: dict, new: dict) -> List[Tuple[str, int, float]]:
+    """Отношение пропускной способности new к old по каждому замеру."""
+    before = {(r['name'], r['size']): r['ops_per_sec']
+              for r in old['results']}
+    return [(r['name'], r['size'],
+             r['ops_per_sec'] / before[(r['name'], r['size'])])
+            for r in new['results'] if (r['name'], r['size']) in before]
+
+
+def report(data: dict) -> str:
+    """Таблица результатов для вывода в консоль."""
+    lines = ['%-34s %9s %12s %9s %9s %9s %11s' % (
+        'benchmark', 'size', 'ops/s', 'p50 ns', 'p95 ns', 'p99 ns', 'peak B')]
+    for r in data['results']:
+        lines.append('%-34s %9d %12.0f %9.0f %9.0f %9.0f %11s' % (
+            r['name'], r['size'], r['ops_per_sec'], r['p50_ns'],
+            r['p95_ns'], r['p99_ns'], r.get('peak_bytes', '-')))
+    return '\n'.join(lines)
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=lambda text: [
+        int(float(size)) for size in text.split(',')], default=list(SIZES),
+        help='количества тренировок через запятую, например 1e3,1e7')
+    parser.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS),
+                        default=list(BENCHMARKS))
+    parser.add_argument('--batch', type=int, default=BATCH)
+    parser.add_argument('--samples', type=int, default=SAMPLES,
+                        help='сколько операций замерять по отдельности')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='не измерять пиковое потребление памяти')
+    parser.add_argument('--output', help='сохранить результаты в JSON')
+    parser.add_argument('--compare', help='JSON с предыдущими результатами')
+    parser.add_argument('--threshold', type=float, default=0.9,
+                        help='минимально допустимое отношение ops/s')
+    parser.add_argument('--threads', type=lambda text: [
+        int(count) for count in text.split(',')],
+        help='замерить масштабирование по потокам, например 1,2,4,8')
+    args = parser.parse_args(argv)
+    if args.threads:
+        print('GIL: %s' % ('включён' if _gil_enabled() else 'выключен'))
+        for row in measure_threads(max(args.sizes), args.threads,
+                                   args.batch):
+            print('threads %(threads)3d %(ops_per_sec)12.0f ops/s' % row)
+        return 0
+    data = run_all(args.sizes, args.only, args.batch, not args.no_memory,
+                   args.samples)
+    print(report(data))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2)
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding='utf-8') as file:
+        ratios = compare(json.load(file), data)
+    regressions = [item for item in ratios if item[2] < args.threshold]
+    for name, size, ratio in ratios:
+        print('%-34s %9d %6.2fx' % (name, size, ratio))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
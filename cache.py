@@ -0,0 +1,97 @@
+"""Кэш результатов тренировок для повторяющихся пакетов."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from homework import (TRAINING_TYPES, InfoMessage, coefficient_names,
+                      read_package)
+
+MAXSIZE: int = 65536  # количество хранимых результатов по умолчанию
+
+
+class ResultCache:
+    """LRU-кэш InfoMessage с необязательным временем жизни записей.
+
+    Ключ — код тренировки и данные пакета. Вместе с результатом хранятся
+    значения коэффициентов класса: если они изменились во время работы,
+    запись считается устаревшей и пересчитывается.
+    Возвращаемые InfoMessage общие для всех попаданий, их нельзя изменять.
+    """
+
+    def __init__(self, maxsize: int = MAXSIZE, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if maxsize <= 0:
+            raise ValueError('Размер кэша должен быть положительным.')
+        self.maxsize: int = maxsize
+        self.ttl: Optional[float] = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._names: Dict[str, Tuple[str, ...]] = {}
+        self.hits = self.misses = self.evictions = 0
+        self.expired = self.stale = 0
+
+    def _fingerprint(self, workout_type: str) -> tuple:
+        """Текущие значения коэффициентов класса тренировки."""
+        cls = TRAINING_TYPES[workout_type]
+        names = self._names.get(workout_type)
+        if names is None:
+            names = self._names[workout_type] = coefficient_names(cls)
+        return (cls,) + tuple(getattr(cls, name) for name in names)
+
+    def _lookup(self, key: tuple, fingerprint: tuple,
+                now: float) -> Optional[InfoMessage]:
+        """Найти актуальную запись; вызывается под блокировкой."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_fingerprint, info, expires = entry
+        if stored_fingerprint != fingerprint:
+            self.stale += 1
+        elif expires is not None and expires <= now:
+            self.expired += 1
+        else:
+            self._entries.move_to_end(key)
+            return info
+        del self._entries[key]
+        return None
+
+    def get_info(self, workout_type: str, data: list) -> InfoMessage:
+        """Вернуть результат тренировки, по возможности из кэша."""
+        if workout_type not in TRAINING_TYPES:
+            raise KeyError('Ошибка! Тип тренировки не определен!')
+        key = (workout_type, tuple(data))
+        fingerprint = self._fingerprint(workout_type)
+        now = self._clock()
+        with self._lock:
+            info = self._lookup(key, fingerprint, now)
+            if info is not None:
+                self.hits += 1
+                return info
+            self.misses += 1
+        info = read_package(workout_type, data).show_training_info()
+        expires = None if self.ttl is None else now + self.ttl
+        with self._lock:
+            self._entries[key] = (fingerprint, info, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return info
+
+    def clear(self) -> None:
+        """Удалить все записи, сохранив статистику."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика попаданий и промахов."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'expired': self.expired,
+                'stale': self.stale, 'size': len(self._entries),
+                'maxsize': self.maxsize}
@@ -0,0 +1,78 @@
+"""Командная строка фитнес-трекера: fitness-tracker <команда>.
+
+Модуль намеренно импортирует только sys: модули обработки подгружаются
+внутри команд, чтобы короткоживущий процесс стартовал быстро.
+"""
+
+import sys
+
+PROG = 'fitness-tracker'
+# бюджет холодного импорта модулей команды process, в микросекундах
+IMPORT_BUDGET_US = 60000
+# модули, которые не должны загружаться при запуске process
+HEAVY_MODULES = ('numpy', 'dataclasses', 'inspect', 'asyncio',
+                 'concurrent.futures')
+# модули, которые stream загружает только по флагам командной строки
+LAZY_MODULES = ('typing', 'argparse', 'hashlib', 'cache', 'dedup', 'metrics',
+                'validation')
+
+
+def measure_import(module: str = 'stream') -> dict:
+    """Замерить импорт модуля в чистом процессе через -X importtime.
+
+    Процесс запускается из каталога проекта, поэтому модули находятся
+    при запуске из любого текущего каталога.
+    """
+    import os
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, _, cumulative, name = (part.strip() for part in
+                                  line.replace(':', '|', 1).split('|'))
+        modules[name] = int(cumulative)
+    return {'module': module, 'total_us': modules.get(module, 0),
+            'modules': modules}
+
+
+def cmd_process(argv: list) -> int:
+    """Потоковая обработка файла с пакетами."""
+    import stream
+
+    stream.run(argv)
+    return 0
+
+
+def cmd_importtime(argv: list) -> int:
+    """Проверить время импорта модулей команды process."""
+    report = measure_import(argv[0] if argv else 'stream')
+    heavy = [name for name in HEAVY_MODULES + LAZY_MODULES
+             if name in report['modules']]
+    print('import %s: %d мкс (бюджет %d мкс)' % (
+        report['module'], report['total_us'], IMPORT_BUDGET_US))
+    if heavy:
+        print('лишние импорты: ' + ', '.join(heavy))
+    return int(report['total_us'] > IMPORT_BUDGET_US or bool(heavy))
+
+
+COMMANDS = {'process': cmd_process, 'importtime': cmd_importtime}
+
+
+def main(argv=None) -> int:
+    """Точка входа: выбрать команду и передать ей остальные аргументы."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print('usage: %s {%s} ...' % (PROG, ','.join(COMMANDS)),
+              file=sys.stderr)
+        return 2
+    return COMMANDS[argv[0]](argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Колоночный двоичный экспорт результатов тренировок.
+
+Файл: заголовок MAGIC и версия (8 байт), далее пачки. Пачка: количество
+строк и количество новых записей словаря типов (uint32 каждое), новые
+записи словаря (uint16 длина + UTF-8), колонка кодов типа тренировки
+(uint16) и колонки duration, distance, speed, calories (float64).
+"""
+
+import argparse
+import struct
+import sys
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from homework import InfoMessage, format_many
+from stream import PARSERS, compute, dispatch, guess_format
+
+MAGIC: bytes = b'FTCL'
+VERSION: int = 1
+HEADER = struct.Struct('<4sB3x')
+BATCH = struct.Struct('<II')
+WORD = struct.Struct('<H')
+BATCH_SIZE: int = 65536  # строк в одной пачке
+
+VALUES: Sequence[str] = ('duration', 'distance', 'speed', 'calories')
+CODE = np.dtype('<u2')
+VALUE = np.dtype('<f8')
+
+
+class ColumnWriter:
+    """Запись результатов пачками со словарным кодированием типов."""
+
+    def __init__(self, out: IO[bytes]) -> None:
+        self._out = out
+        self._dictionary: Dict[str, int] = {}
+        out.write(HEADER.pack(MAGIC, VERSION))
+
+    def _encode(self, training_types: Sequence[str]) -> tuple:
+        """Коды типов тренировок и записи словаря, появившиеся впервые."""
+        new: List[str] = []
+        codes = np.empty(len(training_types), dtype=CODE)
+        dictionary = self._dictionary
+        for i, name in enumerate(training_types):
+            code = dictionary.get(name)
+            if code is None:
+                code = dictionary[name] = len(dictionary)
+                new.append(name)
+            codes[i] = code
+        return codes, new
+
+    def write_columns(self, training_types: Sequence[str],
+                      columns: Dict[str, Sequence[float]]) -> None:
+        """Записать пачку из колонок одинаковой длины."""
+        codes, new = self._encode(training_types)
+        out = self._out
+        out.write(BATCH.pack(len(codes), len(new)))
+        for name in new:
+            encoded = name.encode('utf-8')
+            out.write(WORD.pack(len(encoded)))
+            out.write(encoded)
+        out.write(codes.tobytes())
+        for name in VALUES:
+            out.write(np.asarray(columns[name], dtype=VALUE).tobytes())
+
+    def write_messages(self, messages: Sequence[InfoMessage]) -> None:
+        """Записать пачку информационных сообщений."""
+        self.write_columns(
+            [info.training_type for info in messages],
+            {name: [getattr(info, name) for info in messages]
+             for name in VALUES})
+
+
+def write_messages(out: IO[bytes], messages: Iterable[InfoMessage],
+                   batch_size: int = BATCH_SIZE) -> int:
+    """Записать поток сообщений в колоночный файл, вернуть число строк."""
+    writer = ColumnWriter(out)
+    messages = iter(messages)
+    total = 0
+    while True:
+        batch = list(islice(messages, batch_size))
+        if not batch:
+            return total
+        writer.write_messages(batch)
+        total += len(batch)
+
+
+def _read_dictionary(data: bytes, offset: int, count: int,
+                     dictionary: List[str]) -> int:
+    """Дочитать новые записи словаря, вернуть смещение после них."""
+    for _ in range(count):
+        (length,) = WORD.unpack_from(data, offset)
+        offset += WORD.size
+        dictionary.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+    return offset
+
+
+def iter_batches(data: bytes) -> Iterator[Dict[str, np.ndarray]]:
+    """Выдать пачки колонок; training_type — массив строк."""
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Ошибка! Неизвестный формат колоночного файла.')
+    dictionary: List[str] = []
+    offset = HEADER.size
+    while offset < len(data):
+        rows, new = BATCH.unpack_from(data, offset)
+        offset = _read_dictionary(data, offset + BATCH.size, new, dictionary)
+        codes = np.frombuffer(data, dtype=CODE, count=rows, offset=offset)
+        offset += rows * CODE.itemsize
+        batch = {'training_type': np.array(dictionary, dtype=object)[codes]}
+        for name in VALUES:
+            batch[name] = np.frombuffer(data, dtype=VALUE, count=rows,
+                                        offset=offset)
+            offset += rows * VALUE.itemsize
+        yield batch
+
+
+def read_columns(path: str) -> Dict[str, np.ndarray]:
+    """Прочитать весь файл в виде колонок."""
+    with open(path, 'rb') as file:
+        batches = list(iter_batches(file.read()))
+    if not batches:
+        return {name: np.empty(0) for name in ('training_type',) + VALUES}
+    return {name: np.concatenate([batch[name] for batch in batches])
+            for name in batches[0]}
+
+
+def iter_messages(path: str) -> Iterator[InfoMessage]:
+    """Восстановить информационные сообщения из колоночного файла."""
+    columns = read_columns(path)
+    for row in zip(columns['training_type'].tolist(),
+                   *(columns[name].tolist() for name in VALUES)):
+        yield InfoMessage(*row)
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help='пакеты -> колоночный файл')
+    export.add_argument('source')
+    export.add_argument('target')
+    export.add_argument('--format', choices=sorted(PARSERS))
+    show = commands.add_parser('show', help='вывести сообщения из файла')
+    show.add_argument('path')
+    args = parser.parse_args(argv)
+    if args.command == 'show':
+        text = format_many(iter_messages(args.path))
+        sys.stdout.write(text + '\n' if text else '')
+        return
+    parse = PARSERS[args.format or guess_format(args.source)]
+    with open(args.source, encoding='utf-8', newline='') as lines, \
+            open(args.target, 'wb') as target:
+        write_messages(target, compute(dispatch(parse(lines))))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,133 @@
+"""Отбрасывание повторно присланных пакетов датчиков."""
+
+import math
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Iterable, Iterator, Optional, Tuple
+
+Package = Tuple[str, list]
+
+WINDOW: int = 100000  # сколько последних пакетов помнить по умолчанию
+
+
+def package_key(workout_type: str, data: list) -> bytes:
+    """Компактный (16 байт) отпечаток пакета; 720 и 720.0 совпадают."""
+    try:
+        values = ','.join(repr(float(value)) for value in data)
+    except (TypeError, ValueError):
+        values = repr(data)
+    text = '%s|%s' % (workout_type, values)
+    return blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class WindowIndex:
+    """Точное множество отпечатков последних window пакетов (LRU)."""
+
+    def __init__(self, window: int = WINDOW) -> None:
+        if window <= 0:
+            raise ValueError('Размер окна должен быть положительным.')
+        self.window: int = window
+        self._keys: 'OrderedDict[bytes, None]' = OrderedDict()
+
+    def add(self, key: bytes) -> bool:
+        """Добавить отпечаток; вернуть True, если он уже был в окне."""
+        keys = self._keys
+        if key in keys:
+            keys.move_to_end(key)
+            return True
+        keys[key] = None
+        if len(keys) > self.window:
+            keys.popitem(last=False)
+        return False
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class BloomFilter:
+    """Фильтр Блума: память фиксирована, возможны ложные срабатывания.
+
+    Размер подбирается по ожидаемому числу пакетов capacity и допустимой
+    доле ложных срабатываний error_rate; max_bytes ограничивает память.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001,
+                 max_bytes: Optional[int] = None) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError('Ошибка! Неверные параметры фильтра Блума.')
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        size = (bits + 7) // 8
+        if max_bytes is not None and size > max_bytes:
+            raise ValueError(
+                'Ошибка! Для capacity=%d и error_rate=%g нужно %d байт, '
+                'а разрешено %d.' % (capacity, error_rate, size, max_bytes))
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self.bits: int = size * 8
+        self.hashes: int = max(1, round(self.bits / capacity * math.log(2)))
+        self.count: int = 0
+        self._array = bytearray(size)
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        """Номера битов ключа (двойное хэширование Кирша—Митценмахера)."""
+        first = int.from_bytes(key[:8], 'little')
+        second = int.from_bytes(key[8:16], 'little') | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.bits
+
+    def __contains__(self, key: bytes) -> bool:
+        array = self._array
+        return all(array[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(key))
+
+    def add(self, key: bytes) -> bool:
+        """Добавить ключ; вернуть True, если он (вероятно) уже был."""
+        array = self._array
+        present = True
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not array[byte] & mask:
+                present = False
+                array[byte] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._array)
+
+    def estimated_error_rate(self) -> float:
+        """Ожидаемая доля ложных срабатываний при текущем заполнении."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)
+                ) ** self.hashes
+
+
+class Deduplicator:
+    """Этап конвейера перед read_package: пропускает только новые пакеты."""
+
+    def __init__(self, index=None) -> None:
+        self.index = WindowIndex() if index is None else index
+        self.seen: int = 0
+        self.dropped: int = 0
+
+    def is_duplicate(self, workout_type: str, data: list) -> bool:
+        """Проверить пакет и запомнить его."""
+        self.seen += 1
+        if self.index.add(package_key(workout_type, data)):
+            self.dropped += 1
+            return True
+        return False
+
+    def filter(self, packages: Iterable[Package]) -> Iterator[Package]:
+        """Выдать пакеты без повторов."""
+        for workout_type, data in packages:
+            if not self.is_duplicate(workout_type, data):
+                yield workout_type, data
+
+    def stats(self) -> dict:
+        return {'seen': self.seen, 'dropped': self.dropped,
+                'passed': self.seen - self.dropped}
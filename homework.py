@@ -1,17 +1,16 @@
 """Модуль фитнес-трекера."""
 
-from dataclasses import asdict, dataclass
-from typing import Dict, Type
+# dataclasses и typing не импортируются ради быстрого старта процесса:
+# аннотации не вычисляются, а InfoMessage описан вручную.
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
 
 
-@dataclass
 class InfoMessage:
     """Информационное сообщение о тренировке."""
-    training_type: str  # имя класса тренировки
-    duration: float  # длительность тренировки в часах
-    distance: float  # дистанция в километрах
-    speed: float  # средняя скорость пользователя
-    calories: float  # кол-во израсходованных килокал.
+    __slots__ = ('training_type', 'duration', 'distance', 'speed', 'calories')
+
     message: str = ('Тип тренировки: {}; '
                     'Длительность: {:.3f} ч.; '
                     'Дистанция: {:.3f} км; '
@@ -19,8 +18,123 @@ class InfoMessage:
                     'Потрачено ккал: {:.3f}.'
                     )
 
+    def __init__(self,
+                 training_type: str,  # имя класса тренировки
+                 duration: float,  # длительность тренировки в часах
+                 distance: float,  # дистанция в километрах
+                 speed: float,  # средняя скорость пользователя
+                 calories: float  # кол-во израсходованных килокал.
+                 ) -> None:
+        self.training_type: str = training_type
+        self.duration: float = duration
+        self.distance: float = distance
+        self.speed: float = speed
+        self.calories: float = calories
+
+    def _astuple(self) -> tuple:
+        return (self.training_type, self.duration, self.distance,
+                self.speed, self.calories)
+
+    def __repr__(self) -> str:
+        return ('InfoMessage(training_type=%r, duration=%r, distance=%r, '
+                'speed=%r, calories=%r)' % self._astuple())
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    __hash__ = None  # изменяемый объект, как и dataclass с eq=True
+
     def get_message(self) -> str:
-        return self.message.format(*asdict(self).values())
+        return self.message.format(self.training_type,
+                                   self.duration,
+                                   self.distance,
+                                   self.speed,
+                                   self.calories)
+
+
+# шаблон сообщения InfoMessage.message, переведённый в %-формат
+MESSAGE_TEMPLATE: str = (InfoMessage.message.replace('%', '%%')
+                         .replace('{}', '%s')
+                         .replace('{:.3f}', '%.3f'))
+
+
+def format_many(messages: Iterable[InfoMessage]) -> str:
+    """Сформировать текст множества сообщений одной строкой."""
+    values: list = []
+    for info in messages:
+        values += (info.training_type,
+                   info.duration,
+                   info.distance,
+                   info.speed,
+                   info.calories)
+    return format_values(values)
+
+
+def format_values(values: list) -> str:
+    """Текст сообщений по плоскому списку значений, по 5 на сообщение."""
+    template = '\n'.join([MESSAGE_TEMPLATE] * (len(values) // 5))
+    return template % tuple(values)
+
+
+# реестр видов спорта: код пакета -> класс тренировки
+TRAINING_TYPES: dict[str, type[Training]] = {}
+# код пакета -> имена параметров конструктора (порядок данных в пакете)
+TRAINING_FIELDS: dict[str, tuple[str, ...]] = {}
+# код пакета -> сколько первых параметров обязательны (у остальных
+# есть значения по умолчанию, их можно не передавать в пакете)
+TRAINING_REQUIRED: dict[str, int] = {}
+
+
+def coefficient_names(cls: type[Training]) -> tuple[str, ...]:
+    """Имена констант класса тренировки (включая унаследованные)."""
+    return tuple(sorted({name for klass in cls.__mro__
+                         for name in vars(klass) if name.isupper()}))
+
+
+CO_VARARGS: int = 0x04      # флаги объекта кода, как в inspect,
+CO_VARKEYWORDS: int = 0x08  # который не импортируется ради быстрого старта
+
+
+def _init_fields(cls: type[Training]) -> tuple[tuple[str, ...], int]:
+    """Имена параметров конструктора и число обязательных из них."""
+    init = cls.__init__
+    while hasattr(init, '__wrapped__'):  # обёртки из functools.wraps
+        init = init.__wrapped__
+    code = getattr(init, '__code__', None)
+    if (code is None
+            or code.co_flags & (CO_VARARGS | CO_VARKEYWORDS)
+            or code.co_kwonlyargcount > len(init.__kwdefaults__ or ())):
+        raise TypeError('Ошибка! Конструктор %s должен принимать данные '
+                        'пакета позиционными параметрами, без *args, '
+                        '**kwargs и обязательных именованных параметров.'
+                        % cls.__name__)
+    fields = code.co_varnames[1:code.co_argcount]
+    return fields, len(fields) - len(init.__defaults__ or ())
+
+
+def register_training(code: str
+                      ) -> Callable[[type[Training]], type[Training]]:
+    """Декоратор: зарегистрировать класс тренировки под кодом пакета."""
+    def decorator(cls: type[Training]) -> type[Training]:
+        if code in TRAINING_TYPES:
+            raise ValueError('Ошибка! Код тренировки %s уже занят классом %s.'
+                             % (code, TRAINING_TYPES[code].__name__))
+        fields, required = _init_fields(cls)
+        TRAINING_TYPES[code] = cls
+        TRAINING_FIELDS[code] = fields
+        TRAINING_REQUIRED[code] = required
+        return cls
+    return decorator
+
+
+def _owner(cls: type, name: str) -> type | None:
+    """Класс иерархии, в котором определён атрибут name."""
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return klass
+    return None
 
 
 class Training:
@@ -29,6 +143,21 @@ class Training:
     H_IN_M: int = 60  # константа для перевода ч. в мин.
     LEN_STEP: float = 0.65  # расстояние за 1 шаг в м.
 
+    # show_training_info вызывает _mean_speed и _spent_calories с уже
+    # рассчитанными значениями, только если get_mean_speed и
+    # get_spent_calories определены в том же классе, что и эти функции
+    # (проверяется при создании подкласса); иначе вызываются сами
+    # переопределённые методы
+    _fast_speed: bool = True
+    _fast_calories: bool = True
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._fast_speed = (_owner(cls, 'get_mean_speed')
+                           is _owner(cls, '_mean_speed'))
+        cls._fast_calories = (_owner(cls, 'get_spent_calories')
+                              is _owner(cls, '_spent_calories'))
+
     def __init__(self,
                  action: int,  # кол-во совершённых действий (шагов/гребков).
                  duration: float,  # длительность тренировки, в ч.
@@ -44,23 +173,34 @@ class Training:
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения в км/ч."""
-        return self.get_distance() / self.duration
+        return self._mean_speed(self.get_distance())
+
+    def _mean_speed(self, distance: float) -> float:
+        """Средняя скорость при уже рассчитанной дистанции."""
+        return distance / self.duration
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
         raise NotImplementedError(
             'Определите get_spent_calories в %s.' % (self.__class__.__name__))
 
+    def _spent_calories(self, mean_speed: float) -> float:
+        """Калории при уже рассчитанной средней скорости."""
+        return self.get_spent_calories()  # для классов без этого метода
+
     def show_training_info(self) -> InfoMessage:
         """Вернуть информационное сообщение о выполненной тренировке."""
         training_type = self.__class__.__name__  # имя класса тренировки
         duration = self.duration                 # длительность тренировки в ч.
         distance = self.get_distance()           # дистанция в километрах
-        speed = self.get_mean_speed()            # средняя скорость
-        calories = self.get_spent_calories()     # количество килокалорий
+        speed = (self._mean_speed(distance)      # средняя скорость
+                 if self._fast_speed else self.get_mean_speed())
+        calories = (self._spent_calories(speed)  # количество килокалорий
+                    if self._fast_calories else self.get_spent_calories())
         return InfoMessage(training_type, duration, distance, speed, calories)
 
 
+@register_training('RUN')
 class Running(Training):
     """Тренировка: бег."""
     COEFF_CALOR_RUN_1: int = 18  # коэффициент №1 из формулы
@@ -68,13 +208,16 @@ class Running(Training):
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
-        mean_speed = self.get_mean_speed()  # расчет средней скорости
+        return self._spent_calories(self.get_mean_speed())
+
+    def _spent_calories(self, mean_speed: float) -> float:
         duration_in_m = self.duration * self.H_IN_M  # длит. тренировки, в м.
         calor = self.COEFF_CALOR_RUN_1 * mean_speed - self.COEFF_CALOR_RUN_2
 
         return calor * self.weight / self.M_IN_KM * duration_in_m
 
 
+@register_training('WLK')
 class SportsWalking(Training):
     """Тренировка: спортивная ходьба."""
     COEFF_CALOR_WALK_1: float = 0.035  # коэффициент №1 из формулы
@@ -95,8 +238,9 @@ class SportsWalking(Training):
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
+        return self._spent_calories(self.get_mean_speed())
 
-        mean_speed = self.get_mean_speed()           # расчет средней скорости
+    def _spent_calories(self, mean_speed: float) -> float:
         duration_in_m = self.duration * self.H_IN_M  # длит. тренировки, в м.
         return (self.COEFF_CALOR_WALK_1
                 * self.weight
@@ -104,6 +248,7 @@ class SportsWalking(Training):
                 * self.COEFF_CALOR_WALK_3 * self.weight) * duration_in_m
 
 
+@register_training('SWM')
 class Swimming(Training):
     """Тренировка: плавание."""
     LEN_STEP: float = 1.38               # расстояние за 1 гребок в м.
@@ -128,30 +273,38 @@ class Swimming(Training):
         distance = self.length_pool * self.count_pool  # расчет дистанции, в м.
         return distance / self.M_IN_KM / self.duration
 
+    def _mean_speed(self, distance: float) -> float:
+        # скорость считается по бассейну, дистанция по гребкам не нужна
+        return self.get_mean_speed()
+
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
+        return self._spent_calories(self.get_mean_speed())
 
-        mean_speed = self.get_mean_speed()  # расчет средней скорости
+    def _spent_calories(self, mean_speed: float) -> float:
         calor = mean_speed + self.COEFF_CALOR_SWIM_1
         return calor * self.COEFF_CALOR_SWIM_2 * self.weight
 
 
 def read_package(workout_type: str, data: list) -> Training:
     """Прочитать данные полученные от датчиков."""
-    training_type: Dict[str, Type[Training]] = {'SWM': Swimming,
-                                                'RUN': Running,
-                                                'WLK': SportsWalking
-                                                }
-    if workout_type not in training_type:
+    if workout_type not in TRAINING_TYPES:
         raise KeyError('Ошибка! Тип тренировки не определен!')
-    else:
-        return training_type.get(workout_type)(*data)
+    total = len(TRAINING_FIELDS[workout_type])
+    required = TRAINING_REQUIRED[workout_type]
+    if not required <= len(data) <= total:
+        expected = ('%d' % total if required == total
+                    else 'от %d до %d' % (required, total))
+        raise ValueError('Ошибка! Для тренировки %s ожидается %s значений, '
+                         'получено %d.' % (workout_type, expected, len(data)))
+    return TRAINING_TYPES[workout_type](*data)
 
 
 def main(training: Training) -> None:
     """Главная функция."""
     info = training.show_training_info()
-    print(info.get_message())
+    # одна запись: строки из разных потоков не перемешиваются
+    print(info.get_message() + '\n', end='')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,134 @@
+"""Счётчики и гистограммы времени по этапам обработки тренировок."""
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+ENV_VAR: str = 'FITNESS_METRICS'  # включить сбор метрик: FITNESS_METRICS=1
+# верхние границы корзин гистограммы, в секундах
+BUCKETS: Tuple[float, ...] = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4,
+                              1e-3, 1e-2, 0.1, 1.0)
+
+Key = Tuple[str, str]  # (этап, код тренировки)
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными корзинами."""
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def observe(self, seconds: float) -> None:
+        """Учесть одно измерение."""
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def as_dict(self) -> dict:
+        return {'buckets': dict(zip(map(repr, BUCKETS), self.counts)),
+                'overflow': self.counts[-1],
+                'sum': self.total,
+                'count': self.count}
+
+
+class Metrics:
+    """Реестр метрик; при выключенном сборе вызовы ничего не делают."""
+
+    def __init__(self, enabled: Optional[bool] = None) -> None:
+        if enabled is None:
+            enabled = os.environ.get(ENV_VAR, '') not in ('', '0')
+        self.enabled: bool = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[Key, Histogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Сбросить накопленные значения."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def observe(self, stage: str, workout_type: str, seconds: float) -> None:
+        """Учесть длительность этапа для вида тренировки."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get((stage, workout_type))
+            if histogram is None:
+                histogram = self._histograms[(stage, workout_type)] = (
+                    Histogram())
+            histogram.observe(seconds)
+
+    def increment(self, name: str, workout_type: str = '',
+                  value: int = 1) -> None:
+        """Увеличить счётчик."""
+        if not self.enabled:
+            return
+        with self._lock:
+            key = (name, workout_type)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self) -> dict:
+        """Снимок всех метрик в виде словаря, пригодного для JSON."""
+        with self._lock:
+            return {
+                'stages': [dict(h.as_dict(), stage=stage,
+                                workout_type=workout_type)
+                           for (stage, workout_type), h
+                           in sorted(self._histograms.items())],
+                'counters': [{'name': name, 'workout_type': workout_type,
+                              'value': value}
+                             for (name, workout_type), value
+                             in sorted(self._counters.items())],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix: str = 'fitness') -> str:
+        """Метрики в текстовом формате Prometheus."""
+        snapshot = self.snapshot()
+        name = prefix + '_stage_seconds'
+        lines = ['# TYPE %s histogram' % name]
+        for stage in snapshot['stages']:
+            labels = 'stage="%s",workout_type="%s"' % (
+                stage['stage'], stage['workout_type'])
+            cumulative = 0
+            for bound, count in zip(BUCKETS, stage['buckets'].values()):
+                cumulative += count
+                lines.append('%s_bucket{%s,le="%r"} %d'
+                             % (name, labels, bound, cumulative))
+            lines.append('%s_bucket{%s,le="+Inf"} %d'
+                         % (name, labels, stage['count']))
+            lines.append('%s_sum{%s} %r' % (name, labels, stage['sum']))
+            lines.append('%s_count{%s} %d' % (name, labels, stage['count']))
+        declared = set()
+        for counter in snapshot['counters']:
+            counter_name = '%s_%s_total' % (prefix, counter['name'])
+            if counter_name not in declared:
+                declared.add(counter_name)
+                lines.append('# TYPE %s counter' % counter_name)
+            lines.append('%s{workout_type="%s"} %d' % (
+                counter_name, counter['workout_type'], counter['value']))
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str) -> None:
+        """Сохранить снимок: .prom — Prometheus, иначе JSON."""
+        text = (self.to_prometheus() if path.endswith('.prom')
+                else self.to_json())
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+
+METRICS = Metrics()  # общий реестр модуля
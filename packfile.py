@@ -0,0 +1,162 @@
+"""Двоичный формат пакетов тренировок с чтением через mmap без копирования.
+
+Файл начинается с заголовка MAGIC и версии (8 байт), далее идут сегменты.
+Сегмент: байт кода тренировки, 3 байта выравнивания, количество записей
+(uint32, little-endian) и записи фиксированной ширины для этого кода.
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+from itertools import groupby, islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from batch import calculate_batch, iter_info_messages
+from homework import format_many
+from stream import PARSERS, Package, guess_format
+
+MAGIC: bytes = b'FTPK'
+VERSION: int = 2  # в версии 1 action и параметры бассейна были int32
+HEADER = struct.Struct('<4sB3x')
+SEGMENT = struct.Struct('<B3xI')
+SEGMENT_SIZE: int = 65536  # максимальное количество записей в сегменте
+
+TYPE_CODES: Dict[str, int] = {'RUN': 1, 'WLK': 2, 'SWM': 3}
+TYPE_NAMES: Dict[int, str] = {code: name for name, code in TYPE_CODES.items()}
+
+# все поля float64: текстовые форматы допускают дробные значения
+# (например, length_pool 25.5), и результат должен совпадать с read_package
+RECORDS: Dict[str, np.dtype] = {
+    'RUN': np.dtype([('action', '<f8'), ('duration', '<f8'),
+                     ('weight', '<f8')]),
+    'WLK': np.dtype([('action', '<f8'), ('duration', '<f8'),
+                     ('weight', '<f8'), ('height', '<f8')]),
+    'SWM': np.dtype([('action', '<f8'), ('duration', '<f8'),
+                     ('weight', '<f8'), ('length_pool', '<f8'),
+                     ('count_pool', '<f8')]),
+}
+
+
+def write_segment(out: IO[bytes], workout_type: str,
+                  rows: List[list]) -> None:
+    """Записать сегмент из строк данных одного вида тренировки."""
+    records = np.array([tuple(data) for data in rows],
+                       dtype=RECORDS[workout_type])
+    out.write(SEGMENT.pack(TYPE_CODES[workout_type], len(records)))
+    out.write(records.tobytes())
+
+
+def write_packages(out: IO[bytes], packages: Iterable[Package],
+                   segment_size: int = SEGMENT_SIZE) -> int:
+    """Преобразовать пакеты в двоичный формат, вернуть число записей."""
+    out.write(HEADER.pack(MAGIC, VERSION))
+    total = 0
+    for workout_type, group in groupby(packages, key=lambda p: p[0]):
+        if workout_type not in TYPE_CODES:
+            raise KeyError('Ошибка! Тип тренировки не определен!')
+        group = iter(group)
+        while True:
+            rows = [data for _, data in islice(group, segment_size)]
+            if not rows:
+                break
+            write_segment(out, workout_type, rows)
+            total += len(rows)
+    return total
+
+
+class PackageFile:
+    """Файл пакетов, отображённый в память.
+
+    Сегменты выдаются как структурированные массивы NumPy поверх mmap,
+    без копирования данных. Массивы держат ссылку на отображение, поэтому
+    файл остаётся доступен, пока они используются.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('Ошибка! Неизвестный формат файла пакетов.')
+
+    def __enter__(self) -> 'PackageFile':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрыть отображение, если на него больше нет ссылок."""
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # освободится вместе с последним массивом-представлением
+
+    def raw_segments(self) -> Iterator[Tuple[str, int, memoryview]]:
+        """Выдать (код, количество записей, байты записей) по сегментам."""
+        view = memoryview(self._map)
+        offset = HEADER.size
+        while offset < len(view):
+            code, count = SEGMENT.unpack_from(view, offset)
+            workout_type = TYPE_NAMES[code]
+            offset += SEGMENT.size
+            size = count * RECORDS[workout_type].itemsize
+            yield workout_type, count, view[offset:offset + size]
+            offset += size
+
+    def segments(self) -> Iterator[Tuple[str, np.ndarray]]:
+        """Выдать (код, структурированный массив) по сегментам."""
+        for workout_type, count, raw in self.raw_segments():
+            yield workout_type, np.frombuffer(
+                raw, dtype=RECORDS[workout_type], count=count)
+
+    def packages(self) -> Iterator[Package]:
+        """Выдать пакеты в виде, пригодном для read_package."""
+        for workout_type, records in self.segments():
+            for row in records.tolist():
+                yield workout_type, list(row)
+
+
+def columns(records: np.ndarray) -> Dict[str, np.ndarray]:
+    """Колонки структурированного массива (представления без копирования)."""
+    return {name: records[name] for name in records.dtype.names}
+
+
+def process(path: str, out: IO[str]) -> int:
+    """Рассчитать все тренировки файла векторно и вывести сообщения."""
+    total = 0
+    with PackageFile(path) as package_file:
+        for workout_type, records in package_file.segments():
+            result = calculate_batch(workout_type, columns(records))
+            out.write(format_many(iter_info_messages(workout_type, result)))
+            out.write('\n')
+            total += len(records)
+    return total
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help='текст -> двоичный формат')
+    convert.add_argument('source')
+    convert.add_argument('target')
+    convert.add_argument('--format', choices=sorted(PARSERS))
+    show = commands.add_parser('process', help='вывести сообщения')
+    show.add_argument('path')
+    args = parser.parse_args(argv)
+    if args.command == 'process':
+        process(args.path, sys.stdout)
+        return
+    parse = PARSERS[args.format or guess_format(args.source)]
+    with open(args.source, encoding='utf-8', newline='') as lines, \
+            open(args.target, 'wb') as target:
+        write_packages(target, parse(lines))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,88 @@
+"""Параллельная обработка пакетов на нескольких ядрах."""
+
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Deque, Iterable, Iterator, List, Optional
+
+from homework import format_many, read_package
+from stream import PARSERS, Package, check_chunk_size, guess_format
+
+CHUNK_SIZE: int = 10000  # количество пакетов в одной порции для процесса
+
+
+def process_chunk(chunk: List[Package]) -> str:
+    """Обработать порцию пакетов и вернуть текст сообщений."""
+    return format_many(read_package(workout_type, data).show_training_info()
+                       for workout_type, data in chunk)
+
+
+def iter_chunks(packages: Iterable[Package],
+                chunk_size: int) -> Iterator[List[Package]]:
+    """Разбить поток пакетов на порции."""
+    check_chunk_size(chunk_size)
+    packages = iter(packages)
+    while True:
+        chunk = list(islice(packages, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_parallel(packages: Iterable[Package],
+                 chunk_size: int = CHUNK_SIZE,
+                 max_workers: Optional[int] = None) -> Iterator[str]:
+    """Выдать тексты порций в исходном порядке, считая их в пуле процессов.
+
+    Одновременно в работе не больше двух порций на процесс, поэтому
+    потребление памяти не зависит от размера входного потока.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers) as executor:
+        for chunk in iter_chunks(packages, chunk_size):
+            pending.append(executor.submit(process_chunk, chunk))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_parallel(packages: Iterable[Package], out: IO[str],
+                   chunk_size: int = CHUNK_SIZE,
+                   max_workers: Optional[int] = None) -> None:
+    """Записать результаты параллельной обработки в поток."""
+    check_chunk_size(chunk_size)
+    for text in run_parallel(packages, chunk_size, max_workers):
+        if text:
+            out.write(text + '\n')
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path', nargs='?', default='-',
+                        help='файл с пакетами или "-" для stdin')
+    parser.add_argument('--format', choices=sorted(PARSERS),
+                        help='формат входных данных')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='количество процессов (по умолчанию все ядра)')
+    args = parser.parse_args(argv)
+    if not args.chunk_size > 0:
+        parser.error('--chunk-size должен быть положительным')
+    parse = PARSERS[args.format or guess_format(args.path)]
+    if args.path == '-':
+        write_parallel(parse(sys.stdin), sys.stdout,
+                       args.chunk_size, args.workers)
+        return
+    with open(args.path, encoding='utf-8', newline='') as lines:
+        write_parallel(parse(lines), sys.stdout,
+                       args.chunk_size, args.workers)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,209 @@
+"""Профили коэффициентов и заранее скомпилированные функции расчёта.
+
+Профиль переопределяет константы классов тренировок (LEN_STEP,
+COEFF_CALOR_RUN_1 и т.д.) для отдельных устройств или групп людей.
+При компиляции значения копируются в замыкания, поэтому расчёт по
+профилю не обращается к атрибутам классов. Изменение констант классов
+после компиляции на профиль не влияет.
+"""
+
+import json
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from batch import KERNELS, Columns, distance
+from homework import (TRAINING_FIELDS, TRAINING_REQUIRED, TRAINING_TYPES,
+                      InfoMessage, coefficient_names)
+
+DEFAULT = 'default'  # имя профиля со значениями из классов
+
+Kernel = Callable[..., Tuple[float, float, float]]
+
+
+def _running_kernel(c: Mapping[str, float]) -> Kernel:
+    len_step, m_in_km, h_in_m = c['LEN_STEP'], c['M_IN_KM'], c['H_IN_M']
+    coeff_1, coeff_2 = c['COEFF_CALOR_RUN_1'], c['COEFF_CALOR_RUN_2']
+
+    def kernel(action, duration, weight):
+        distance = action * len_step / m_in_km
+        speed = distance / duration
+        calor = coeff_1 * speed - coeff_2
+        return distance, speed, calor * weight / m_in_km * (duration * h_in_m)
+    return kernel
+
+
+def _walking_kernel(c: Mapping[str, float]) -> Kernel:
+    len_step, m_in_km, h_in_m = c['LEN_STEP'], c['M_IN_KM'], c['H_IN_M']
+    coeff_1, coeff_2, coeff_3 = (c['COEFF_CALOR_WALK_1'],
+                                 c['COEFF_CALOR_WALK_2'],
+                                 c['COEFF_CALOR_WALK_3'])
+
+    def kernel(action, duration, weight, height):
+        distance = action * len_step / m_in_km
+        speed = distance / duration
+        return distance, speed, (coeff_1
+                                 * weight
+                                 + (speed ** coeff_2 // height)
+                                 * coeff_3 * weight) * (duration * h_in_m)
+    return kernel
+
+
+def _swimming_kernel(c: Mapping[str, float]) -> Kernel:
+    len_step, m_in_km = c['LEN_STEP'], c['M_IN_KM']
+    coeff_1, coeff_2 = c['COEFF_CALOR_SWIM_1'], c['COEFF_CALOR_SWIM_2']
+
+    def kernel(action, duration, weight, length_pool, count_pool):
+        distance = action * len_step / m_in_km
+        speed = length_pool * count_pool / m_in_km / duration
+        return distance, speed, (speed + coeff_1) * coeff_2 * weight
+    return kernel
+
+
+SCALAR_BUILDERS: Dict[str, Callable[[Mapping[str, float]], Kernel]] = {
+    'RUN': _running_kernel,
+    'WLK': _walking_kernel,
+    'SWM': _swimming_kernel,
+}
+
+
+def _generic_kernel(workout_type: str,
+                    coefficients: Mapping[str, float]) -> Kernel:
+    """Расчёт для вида спорта без специальной функции: через подкласс."""
+    base = TRAINING_TYPES[workout_type]
+    cls = type(base.__name__, (base,), dict(coefficients))
+
+    def kernel(*data):
+        training = cls(*data)
+        return (training.get_distance(), training.get_mean_speed(),
+                training.get_spent_calories())
+    return kernel
+
+
+class Profile:
+    """Скомпилированный профиль: скалярные и векторные функции по кодам."""
+
+    def __init__(self, name: str,
+                 overrides: Mapping[str, Mapping[str, float]]) -> None:
+        unknown = set(overrides) - set(TRAINING_TYPES)
+        if unknown:
+            raise KeyError('Ошибка! Тип тренировки не определен: %s'
+                           % ', '.join(sorted(unknown)))
+        self.name: str = name
+        self.coefficients: Dict[str, Dict[str, float]] = {}
+        self._scalar: Dict[str, Kernel] = {}
+        self._constants: Dict[str, SimpleNamespace] = {}
+        self._names: Dict[str, str] = {}
+        self._arity: Dict[str, Tuple[int, int]] = {}
+        self._duration: Dict[str, int] = {}  # номер duration в данных
+        for workout_type, cls in TRAINING_TYPES.items():
+            fields = TRAINING_FIELDS[workout_type]
+            self._names[workout_type] = cls.__name__
+            self._arity[workout_type] = (TRAINING_REQUIRED[workout_type],
+                                         len(fields))
+            self._duration[workout_type] = fields.index('duration')
+            values = {key: getattr(cls, key)
+                      for key in coefficient_names(cls)}
+            extra = set(overrides.get(workout_type, {})) - set(values)
+            if extra:
+                raise ValueError('Ошибка! Неизвестные коэффициенты %s: %s'
+                                 % (workout_type, ', '.join(sorted(extra))))
+            values.update(overrides.get(workout_type, {}))
+            self.coefficients[workout_type] = values
+            builder = SCALAR_BUILDERS.get(workout_type)
+            self._scalar[workout_type] = (
+                builder(values) if builder is not None
+                else _generic_kernel(workout_type, values))
+            self._constants[workout_type] = SimpleNamespace(**values)
+
+    def scalar(self, workout_type: str) -> Kernel:
+        """Функция (данные пакета) -> (дистанция, скорость, калории)."""
+        return self._scalar[workout_type]
+
+    def _kernel(self, workout_type: str, data: Sequence[float]) -> Kernel:
+        """Скалярная функция для пакета, с проверками как в read_package."""
+        if workout_type not in self._scalar:
+            raise KeyError('Ошибка! Тип тренировки не определен!')
+        low, high = self._arity[workout_type]
+        if not low <= len(data) <= high:
+            raise ValueError('Ошибка! Неверное количество значений.')
+        return self._scalar[workout_type]
+
+    def info(self, workout_type: str, data: Sequence[float]) -> InfoMessage:
+        """Информационное сообщение для одного пакета по профилю."""
+        distance, speed, calories = self._kernel(workout_type, data)(*data)
+        return InfoMessage(self._names[workout_type],
+                           data[self._duration[workout_type]],
+                           distance, speed, calories)
+
+    def values(self, packages: Iterable[Tuple[str, Sequence[float]]]
+               ) -> list:
+        """Плоский список значений сообщений для homework.format_values.
+
+        На пакет не создаются ни объект тренировки, ни InfoMessage; профиль
+        после компиляции не меняется, поэтому метод можно вызывать из
+        нескольких потоков одновременно.
+        """
+        values: list = []
+        kernel, names, duration = self._kernel, self._names, self._duration
+        for workout_type, data in packages:
+            result = kernel(workout_type, data)(*data)
+            values += (names[workout_type], data[duration[workout_type]],
+                       *result)
+        return values
+
+    def calculate(self, workout_type: str,
+                  columns: Mapping[str, Sequence]) -> Columns:
+        """Векторный расчёт колонок, как batch.calculate_batch."""
+        if workout_type not in KERNELS:
+            raise KeyError('Ошибка! Нет векторного расчёта для %s.'
+                           % workout_type)
+        constants = self._constants[workout_type]
+        col = {name: np.asarray(columns[name])
+               for name in TRAINING_FIELDS[workout_type]}
+        speed_kernel, calories_kernel = KERNELS[workout_type]
+        speed = speed_kernel(constants, col)
+        return {'duration': col['duration'],
+                'distance': distance(constants, col),
+                'speed': speed,
+                'calories': calories_kernel(constants, col, speed)}
+
+
+def compile_profiles(config: Mapping[str, Mapping]) -> Dict[str, Profile]:
+    """Скомпилировать профили из словаря {имя: {код: {константа: значение}}}.
+
+    Профиль DEFAULT со значениями классов добавляется, если не задан.
+    """
+    profiles = {name: Profile(name, overrides)
+                for name, overrides in config.items()}
+    profiles.setdefault(DEFAULT, Profile(DEFAULT, {}))
+    return profiles
+
+
+def load_profiles(path: str) -> Dict[str, Profile]:
+    """Загрузить и скомпилировать профили из JSON-файла."""
+    with open(path, encoding='utf-8') as file:
+        return compile_profiles(json.load(file))
+
+
+def calculate_by_profile(workout_type: str, columns: Mapping[str, Sequence],
+                         profile_names: Sequence[str],
+                         profiles: Mapping[str, Profile]) -> Columns:
+    """Векторный расчёт, где у каждой строки свой профиль.
+
+    Строки группируются по профилю, каждая группа считается одним вызовом
+    скомпилированной функции, результаты раскладываются по местам.
+    """
+    names = np.asarray(profile_names)
+    col = {name: np.asarray(columns[name])
+           for name in TRAINING_FIELDS[workout_type]}
+    result = {key: np.empty(len(names))
+              for key in ('duration', 'distance', 'speed', 'calories')}
+    for name in np.unique(names).tolist():
+        mask = names == name
+        part = profiles[name].calculate(
+            workout_type, {key: value[mask] for key, value in col.items()})
+        for key, values in part.items():
+            result[key][mask] = values
+    return result
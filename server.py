@@ -0,0 +1,185 @@
+"""Asyncio-сервис: приём пакетов датчиков по сети и выдача сообщений."""
+
+import argparse
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from bench import percentile
+from cache import ResultCache
+from homework import read_package
+from stream import parse_csv, parse_ndjson
+
+READ_SIZE: int = 64 * 1024  # сколько байт читать из сокета за раз
+MAX_LINE: int = 64 * 1024  # самая длинная допустимая строка-пакет, в байтах
+TOO_LONG: str = 'Ошибка: строка длиннее %d байт' % MAX_LINE
+SAMPLE_LINES: List[bytes] = [b'["SWM", [720, 1, 80, 25, 40]]\n',
+                             b'["RUN", [15000, 1, 75]]\n',
+                             b'WLK,9000,1,75,180\n']
+
+
+def handle_line(line: Union[bytes, str],
+                cache: Optional[ResultCache] = None) -> str:
+    """Обработать одну строку-пакет (NDJSON или CSV) и вернуть ответ."""
+    try:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        parse = parse_ndjson if line.lstrip()[:1] in ('[', '{') else parse_csv
+        workout_type, data = next(parse([line]))
+        if cache is not None:
+            return cache.get_info(workout_type, data).get_message()
+        return read_package(workout_type, data).show_training_info(
+        ).get_message()
+    except (ValueError, KeyError, TypeError, StopIteration,
+            ArithmeticError, RecursionError) as error:
+        # UnicodeDecodeError — подкласс ValueError, OverflowError —
+        # ArithmeticError, RecursionError — слишком глубокая вложенность
+        # JSON: ни одна строка не обрывает подключение
+        return 'Ошибка: %s' % (error,)
+
+
+def handle_lines(lines: List[bytes],
+                 cache: Optional[ResultCache] = None) -> bytes:
+    """Обработать пачку строк; на каждую строку — одна строка ответа."""
+    answers = [TOO_LONG if len(line) > MAX_LINE else handle_line(line, cache)
+               for line in lines]
+    answers.append('')
+    return '\n'.join(answers).encode('utf-8')
+
+
+def take_lines(buffer: bytes,
+               skipping: bool) -> Tuple[List[bytes], bytes, bool]:
+    """Выделить из буфера полные строки и незавершённый хвост.
+
+    Хвост длиннее MAX_LINE не копится: он сразу отдаётся как строка (на
+    неё будет ответ об ошибке), а остаток этой строки до перевода строки
+    отбрасывается (skipping). Так память на подключение ограничена.
+    """
+    *lines, tail = buffer.split(b'\n')
+    if skipping and lines:
+        lines.pop(0)  # конец слишком длинной строки, ответ уже отправлен
+        skipping = False
+    elif skipping:
+        tail = b''
+    if len(tail) > MAX_LINE:
+        lines.append(tail)
+        tail, skipping = b'', True
+    return lines, tail, skipping
+
+
+async def handle_connection(reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter,
+                            cache: Optional[ResultCache] = None) -> None:
+    """Обслужить одно подключение устройства.
+
+    Все полные строки, уже полученные из сокета, обрабатываются одной
+    пачкой и отправляются одним write. Следующее чтение начинается только
+    после drain(), поэтому медленный клиент тормозит только себя.
+    """
+    tail, skipping = b'', False
+    try:
+        while True:
+            chunk = await reader.read(READ_SIZE)
+            if not chunk:
+                break
+            lines, tail, skipping = take_lines(tail + chunk, skipping)
+            if lines:
+                writer.write(handle_lines(lines, cache))
+                await writer.drain()
+        if tail.strip():
+            writer.write(handle_lines([tail], cache))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start(host: str = '127.0.0.1', port: int = 8765,
+                path: Optional[str] = None,
+                cache: Optional[ResultCache] = None) -> asyncio.AbstractServer:
+    """Запустить сервер на TCP-порту или Unix-сокете."""
+    async def handler(reader, writer):
+        await handle_connection(reader, writer, cache)
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path)
+    return await asyncio.start_server(handler, host, port)
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765,
+                path: Optional[str] = None, cache_size: int = 0) -> None:
+    """Работать, пока процесс не будет остановлен."""
+    cache = ResultCache(cache_size) if cache_size else None
+    server = await start(host, port, path, cache)
+    async with server:
+        await server.serve_forever()
+
+
+async def _client(host: str, port: int, path: Optional[str], requests: int,
+                  window: int, latencies: List[float]) -> None:
+    """Один клиент генератора нагрузки: не больше window пакетов в пути."""
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    sent: Deque[float] = deque()
+    received = 0
+    while received < requests:
+        burst = min(window - len(sent), requests - received - len(sent))
+        if burst > 0:
+            now = time.perf_counter()
+            writer.write(b''.join(SAMPLE_LINES[(received + len(sent) + i)
+                                               % len(SAMPLE_LINES)]
+                                  for i in range(burst)))
+            sent.extend([now] * burst)
+            await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - sent.popleft())
+        received += 1
+    writer.close()
+
+
+async def load(host: str = '127.0.0.1', port: int = 8765,
+               path: Optional[str] = None, connections: int = 10,
+               requests: int = 1000, window: int = 32) -> Dict[str, float]:
+    """Нагрузить сервер и вернуть пропускную способность и задержки."""
+    latencies: List[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, path, requests, window, latencies)
+        for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    return {'requests': len(latencies),
+            'seconds': elapsed,
+            'requests_per_sec': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000}
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('mode', choices=('serve', 'load'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH', help='путь Unix-сокета')
+    parser.add_argument('--cache-size', type=int, default=0)
+    parser.add_argument('--connections', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=1000,
+                        help='пакетов на одно подключение')
+    parser.add_argument('--window', type=int, default=32,
+                        help='пакетов в пути на одно подключение')
+    args = parser.parse_args(argv)
+    if args.mode == 'serve':
+        asyncio.run(serve(args.host, args.port, args.unix, args.cache_size))
+        return
+    result = asyncio.run(load(args.host, args.port, args.unix,
+                              args.connections, args.requests, args.window))
+    print('Запросов: %(requests)d; за %(seconds).2f с; '
+          '%(requests_per_sec).0f запр./с; p50: %(p50_ms).3f мс; '
+          'p99: %(p99_ms).3f мс.' % result)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,216 @@
+"""Шардированная пакетная обработка с локальным координатором.
+
+Входные пакеты (NDJSON) делятся на шарды по хэшу спортсмена или по
+диапазонам строк. Каждый шард обрабатывается отдельным процессом
+(заменой узла кластера): результаты и агрегаты пишутся в рабочий
+каталог, готовый шард отмечается файлом .done. Координатор объединяет
+результаты в исходном порядке строк. При повторном запуске готовые
+шарды пропускаются, поэтому упавший шард можно просто перезапустить.
+Продолжить можно только тот же запуск: вход (путь, размер, время
+изменения), число шардов и способ разбиения сверяются с отметкой
+о разбиении.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from aggregate import Aggregator
+from homework import read_package
+
+PARTITIONED = 'partitioned'  # отметка о завершённом разбиении входа
+
+Record = Tuple[str, str, list]  # (спортсмен, код тренировки, данные)
+
+
+def parse_record(line: str) -> Record:
+    """Разобрать строку NDJSON; поле athlete необязательно."""
+    record = json.loads(line)
+    if isinstance(record, dict):
+        return (record.get('athlete', ''), record['workout_type'],
+                record['data'])
+    workout_type, data = record
+    return '', workout_type, data
+
+
+def shard_of_athlete(athlete: str, shards: int) -> int:
+    """Номер шарда по устойчивому хэшу спортсмена."""
+    return zlib.crc32(athlete.encode('utf-8')) % shards
+
+
+def _path(workdir: str, shard: int, suffix: str) -> str:
+    return os.path.join(workdir, 'shard-%04d.%s' % (shard, suffix))
+
+
+def source_identity(path: str) -> dict:
+    """Признаки входного файла, по которым узнаётся тот же вход."""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns}
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """Записать файл целиком или не записать вовсе."""
+    temp = path + '.tmp'
+    with open(temp, 'w', encoding='utf-8') as file:
+        file.write(text)
+    os.replace(temp, path)
+
+
+def partition(source: IO[str], workdir: str, shards: int,
+              by: str = 'athlete',
+              identity: Optional[dict] = None) -> List[int]:
+    """Разложить входные строки по шардам, вернуть их размеры.
+
+    Каждая строка шарда хранит свой порядковый номер во входе.
+    identity (source_identity входа) сохраняется в отметке о разбиении.
+    by='athlete' — по хэшу спортсмена, by='range' — по диапазонам строк
+    (для него source читается дважды, поэтому должен поддерживать seek).
+    """
+    per_shard = 1
+    if by == 'range':  # первый проход: сколько строк во входе
+        per_shard = -(-sum(1 for line in source if line.strip())
+                      // shards) or 1
+        source.seek(0)
+    lines = (line for line in source if line.strip())
+    sizes = [0] * shards
+    outputs = [open(_path(workdir, shard, 'in.tmp'), 'w', encoding='utf-8')
+               for shard in range(shards)]
+    try:
+        for seq, line in enumerate(lines):
+            if by == 'range':
+                shard = seq // per_shard
+            else:
+                shard = shard_of_athlete(parse_record(line)[0], shards)
+            outputs[shard].write('%d\t%s' % (seq, line.rstrip('\n') + '\n'))
+            sizes[shard] += 1
+    finally:
+        for output in outputs:
+            output.close()
+    for shard in range(shards):
+        os.replace(_path(workdir, shard, 'in.tmp'),
+                   _path(workdir, shard, 'in'))
+    _write_atomic(os.path.join(workdir, PARTITIONED), json.dumps(
+        {'source': identity, 'shards': shards, 'by': by, 'sizes': sizes}))
+    return sizes
+
+
+def process_shard(workdir: str, shard: int) -> int:
+    """Обработать один шард: результаты, агрегаты и отметка .done."""
+    aggregator = Aggregator()
+    results: List[str] = []
+    with open(_path(workdir, shard, 'in'), encoding='utf-8') as lines:
+        for line in lines:
+            seq, text = line.split('\t', 1)
+            athlete, workout_type, data = parse_record(text)
+            info = read_package(workout_type, data).show_training_info()
+            aggregator.add(info, athlete)
+            results.append(json.dumps([int(seq), info.get_message()],
+                                      ensure_ascii=False))
+    _write_atomic(_path(workdir, shard, 'out'),
+                  ''.join(result + '\n' for result in results))
+    _write_atomic(_path(workdir, shard, 'agg.json'),
+                  json.dumps(aggregator.snapshot()))
+    _write_atomic(_path(workdir, shard, 'done'), '')
+    return len(results)
+
+
+def pending_shards(workdir: str, shards: int) -> List[int]:
+    """Шарды без отметки о готовности."""
+    return [shard for shard in range(shards)
+            if not os.path.exists(_path(workdir, shard, 'done'))]
+
+
+def _read_results(path: str) -> Iterator[Tuple[int, str]]:
+    with open(path, encoding='utf-8') as lines:
+        for line in lines:
+            seq, message = json.loads(line)
+            yield seq, message
+
+
+def merge(workdir: str, shards: int, out: IO[str]) -> Aggregator:
+    """Объединить результаты шардов в исходном порядке и их агрегаты."""
+    streams = [_read_results(_path(workdir, shard, 'out'))
+               for shard in range(shards)]
+    for _, message in heapq.merge(*streams):
+        out.write(message + '\n')
+    total = Aggregator()
+    for shard in range(shards):  # фиксированный порядок — тот же результат
+        with open(_path(workdir, shard, 'agg.json'), encoding='utf-8') as f:
+            total.merge(Aggregator.restore(json.load(f)))
+    return total
+
+
+def _check_marker(marker: str, expected: dict) -> None:
+    """Проверить, что отметка о разбиении относится к этому же запуску."""
+    with open(marker, encoding='utf-8') as file:
+        saved = json.load(file)
+    changed = sorted(key for key, value in expected.items()
+                     if saved.get(key) != value)
+    if changed:
+        raise ValueError('Ошибка! Рабочий каталог %s разбит для другого '
+                         'запуска (отличаются: %s); укажите новый каталог '
+                         'или очистите этот.'
+                         % (os.path.dirname(marker), ', '.join(changed)))
+
+
+def run_sharded(source_path: str, workdir: str, out: IO[str],
+                shards: int = 4, workers: Optional[int] = None,
+                by: str = 'athlete') -> Aggregator:
+    """Разбить вход, обработать незавершённые шарды и объединить итог.
+
+    Если workdir уже разбит для другого входа или с другими shards и by,
+    возбуждается ValueError: иначе вышли бы результаты прошлого запуска.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    marker = os.path.join(workdir, PARTITIONED)
+    identity = source_identity(source_path)
+    if os.path.exists(marker):
+        _check_marker(marker, {'source': identity, 'shards': shards,
+                               'by': by})
+    else:
+        with open(source_path, encoding='utf-8') as source:
+            partition(source, workdir, shards, by, identity)
+    todo = pending_shards(workdir, shards)
+    errors: Dict[int, BaseException] = {}
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {shard: executor.submit(process_shard, workdir, shard)
+                   for shard in todo}
+        for shard, future in futures.items():
+            try:
+                future.result()
+            except Exception as error:
+                errors[shard] = error
+    if errors:
+        raise RuntimeError('Ошибка! Не обработаны шарды %s: %s; '
+                           'повторный запуск продолжит с них.'
+                           % (sorted(errors), errors[min(errors)]))
+    return merge(workdir, shards, out)
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0])
+    parser.add_argument('source', help='входной файл NDJSON')
+    parser.add_argument('workdir', help='рабочий каталог шардов')
+    parser.add_argument('--output', required=True, help='файл сообщений')
+    parser.add_argument('--aggregates', help='файл итоговых агрегатов JSON')
+    parser.add_argument('--shards', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--by', choices=('athlete', 'range'),
+                        default='athlete')
+    args = parser.parse_args(argv)
+    with open(args.output, 'w', encoding='utf-8') as out:
+        total = run_sharded(args.source, args.workdir, out, args.shards,
+                            args.workers, args.by)
+    if args.aggregates:
+        _write_atomic(args.aggregates, json.dumps(total.snapshot()))
+
+
+if __name__ == '__main__':
+    run()
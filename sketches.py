@@ -0,0 +1,318 @@
+"""Приближённые перцентили и top-K по потоку результатов тренировок."""
+
+import argparse
+import heapq
+import json
+import math
+import random
+import sys
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from homework import InfoMessage
+from stream import PARSERS, compute, dispatch, guess_format
+
+K: int = 200  # точность скетча по умолчанию: ошибка ранга около 1.3%
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+SKETCHED: Tuple[str, ...] = ('speed', 'calories')
+CAPACITY_DECAY: float = 2 / 3  # во сколько раз уменьшается нижний уровень
+
+
+class KLLSketch:
+    """Квантильный скетч KLL (Karnin, Lang, Liberty, 2016).
+
+    Память — O(k) значений при любом размере потока. Уровень h хранит
+    значения с весом 2**h; переполненный уровень сортируется, и каждое
+    второе значение переходит на уровень выше.
+    """
+
+    def __init__(self, k: int = K, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError('Ошибка! Параметр k должен быть не меньше 8.')
+        self.k: int = k
+        self.count: int = 0
+        self.min: float = math.inf
+        self.max: float = -math.inf
+        self.levels: List[List[float]] = [[]]
+        self._size: int = 0
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * CAPACITY_DECAY ** depth))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def add(self, value: float) -> None:
+        """Учесть одно значение."""
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.levels[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size():
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def _compress(self) -> None:
+        """Сжимать уровни, пока размер не станет меньше допустимого."""
+        while self._size >= self._max_size():
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacity(level):
+                    break
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            items.sort()
+            # при нечётной длине последнее значение остаётся на уровне
+            keep = [items.pop()] if len(items) % 2 else []
+            promoted = items[self._random.getrandbits(1)::2]
+            self.levels[level + 1].extend(promoted)
+            self.levels[level] = keep
+            self._size -= len(items) - len(promoted)
+
+    def merge(self, other: 'KLLSketch') -> None:
+        """Объединить со скетчем другого обработчика (с тем же k)."""
+        if other.k != self.k:
+            raise ValueError('Ошибка! Скетчи с разным k не объединяются.')
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._size += sum(len(items) for items in other.levels)
+        self._compress()
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        return sorted((value, 1 << level)
+                      for level, items in enumerate(self.levels)
+                      for value in items)
+
+    def quantile(self, q: float) -> float:
+        """Значение, ниже которого лежит доля q потока (± rank_error)."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Несколько квантилей за одну сортировку."""
+        if not self.count:
+            raise ValueError('Ошибка! Скетч пуст.')
+        weighted = self._weighted()
+        total = sum(weight for _, weight in weighted)
+        result = []
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ValueError('Ошибка! Квантиль должен быть в [0, 1].')
+            result.append(self._find(weighted, q * total, q))
+        return result
+
+    def _find(self, weighted: List[Tuple[float, int]], target: float,
+              q: float) -> float:
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return self.max
+
+    def rank_error(self) -> float:
+        """Ошибка нормированного ранга для 99% запросов.
+
+        Эмпирическая формула для KLL из Apache DataSketches: 2.296 / k**0.9723.
+        Пока поток не сжимался (count меньше ёмкости), ответы точные.
+        """
+        if len(self.levels) == 1:
+            return 0.0
+        return 2.296 / self.k ** 0.9723
+
+    def __len__(self) -> int:
+        """Сколько значений хранится (не сколько учтено)."""
+        return self._size
+
+    def snapshot(self) -> dict:
+        """Состояние в виде словаря, пригодного для JSON."""
+        return {'k': self.k, 'count': self.count,
+                'min': self.min if self.count else None,
+                'max': self.max if self.count else None,
+                'levels': [list(items) for items in self.levels]}
+
+    @classmethod
+    def restore(cls, snapshot: dict) -> 'KLLSketch':
+        """Восстановить скетч из снимка."""
+        sketch = cls(snapshot['k'])
+        sketch.count = snapshot['count']
+        if sketch.count:
+            sketch.min, sketch.max = snapshot['min'], snapshot['max']
+        sketch.levels = [list(items) for items in snapshot['levels']]
+        sketch._size = sum(len(items) for items in sketch.levels)
+        return sketch
+
+
+class TopK:
+    """N наибольших значений с сопутствующими записями (min-куча).
+
+    Результат точный, в том числе после объединения: глобальные top-N
+    всегда входят в объединение top-N отдельных обработчиков.
+    """
+
+    def __init__(self, n: int = 10) -> None:
+        if n <= 0:
+            raise ValueError('Ошибка! Размер top-K должен быть положительным.')
+        self.n: int = n
+        self._heap: List[Tuple[float, tuple]] = []
+
+    def add(self, value: float, item: tuple) -> None:
+        """Учесть значение; item хранится вместе с ним."""
+        entry = (value, tuple(item))
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: 'TopK') -> None:
+        for value, item in other._heap:
+            self.add(value, item)
+
+    def items(self) -> List[Tuple[float, tuple]]:
+        """Записи по убыванию значения."""
+        return sorted(self._heap, reverse=True)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def snapshot(self) -> dict:
+        return {'n': self.n,
+                'items': [[value, list(item)] for value, item in self._heap]}
+
+    @classmethod
+    def restore(cls, snapshot: dict) -> 'TopK':
+        top = cls(snapshot['n'])
+        for value, item in snapshot['items']:
+            top.add(value, item)
+        return top
+
+
+class ResultStats:
+    """Перцентили скорости и калорий по типам тренировок и top-N сессий.
+
+    Самые тяжёлые сессии выбираются по потраченным калориям. Из seed для
+    каждого скетча выводится своё зерно (по типу тренировки и метрике):
+    с общим зерном случайные сжатия скетчей совпадали бы и их ошибки
+    были бы связаны.
+    """
+
+    def __init__(self, k: int = K, top: int = 10,
+                 seed: Optional[int] = None) -> None:
+        self.k: int = k
+        self.seed: Optional[int] = seed
+        self.sketches: Dict[str, Dict[str, KLLSketch]] = {}
+        self.heaviest: TopK = TopK(top)
+
+    def _group(self, training_type: str) -> Dict[str, KLLSketch]:
+        group = self.sketches.get(training_type)
+        if group is None:
+            group = self.sketches[training_type] = {
+                name: KLLSketch(self.k, self._sketch_seed(training_type, name))
+                for name in SKETCHED}
+        return group
+
+    def _sketch_seed(self, training_type: str, metric: str) -> Optional[int]:
+        """Зерно скетча: своё для каждой пары (тип тренировки, метрика)."""
+        if self.seed is None:
+            return None
+        key = '%d:%s:%s' % (self.seed, training_type, metric)
+        return zlib.crc32(key.encode('utf-8'))
+
+    def add(self, info: InfoMessage) -> None:
+        """Учесть результат одной тренировки."""
+        group = self._group(info.training_type)
+        group['speed'].add(info.speed)
+        group['calories'].add(info.calories)
+        self.heaviest.add(info.calories, (info.training_type, info.duration,
+                                          info.distance, info.speed,
+                                          info.calories))
+
+    def update(self, messages: Iterable[InfoMessage]) -> None:
+        for info in messages:
+            self.add(info)
+
+    def merge(self, other: 'ResultStats') -> None:
+        """Добавить статистику, накопленную другим обработчиком."""
+        for training_type, other_group in other.sketches.items():
+            group = self._group(training_type)
+            for name in SKETCHED:
+                group[name].merge(other_group[name])
+        self.heaviest.merge(other.heaviest)
+
+    def percentiles(self, training_type: str, metric: str,
+                    qs: Sequence[float] = QUANTILES) -> Dict[str, float]:
+        """Перцентили метрики, например {'p50': ..., 'p95': ...}."""
+        sketch = self.sketches[training_type][metric]
+        return {'p%g' % (q * 100): value
+                for q, value in zip(qs, sketch.quantiles(qs))}
+
+    def top(self) -> List[InfoMessage]:
+        """Самые тяжёлые сессии по убыванию калорий."""
+        return [InfoMessage(*item) for _, item in self.heaviest.items()]
+
+    def report(self, qs: Sequence[float] = QUANTILES) -> dict:
+        """Сводка для JSON: перцентили, ошибка ранга и top-N."""
+        types = {}
+        for training_type, group in sorted(self.sketches.items()):
+            types[training_type] = {'count': group['speed'].count,
+                                    'rank_error': group['speed'].rank_error()}
+            for name in SKETCHED:
+                types[training_type][name] = self.percentiles(
+                    training_type, name, qs)
+        return {'types': types,
+                'heaviest': [list(item)
+                             for _, item in self.heaviest.items()]}
+
+    def snapshot(self) -> dict:
+        """Состояние в виде словаря, пригодного для JSON."""
+        return {'k': self.k,
+                'sketches': {training_type: {name: sketch.snapshot()
+                                             for name, sketch in group.items()}
+                             for training_type, group
+                             in sorted(self.sketches.items())},
+                'heaviest': self.heaviest.snapshot()}
+
+    @classmethod
+    def restore(cls, snapshot: dict) -> 'ResultStats':
+        """Восстановить статистику из снимка."""
+        stats = cls(snapshot['k'], snapshot['heaviest']['n'])
+        stats.heaviest = TopK.restore(snapshot['heaviest'])
+        for training_type, group in snapshot['sketches'].items():
+            stats.sketches[training_type] = {
+                name: KLLSketch.restore(group[name]) for name in SKETCHED}
+        return stats
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки: отчёт в JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('source')
+    parser.add_argument('--format', choices=sorted(PARSERS))
+    parser.add_argument('--k', type=int, default=K)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+    stats = ResultStats(args.k, args.top)
+    parse = PARSERS[args.format or guess_format(args.source)]
+    with open(args.source, encoding='utf-8', newline='') as lines:
+        stats.update(compute(dispatch(parse(lines))))
+    json.dump(stats.report(), sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,361 @@
+"""Потоковая обработка пакетов датчиков из файла или stdin."""
+
+# Ради быстрого старта typing, argparse и модули необязательных этапов
+# (кэш, метрики, проверка, отбрасывание повторов) импортируются только
+# там, где они нужны; аннотации не вычисляются.
+from __future__ import annotations
+
+import _thread  # в отличие от threading, загружен при старте интерпретатора
+import csv
+import json
+import os
+import sys
+from itertools import islice
+from time import perf_counter
+
+from homework import (InfoMessage, Training, format_many, format_values,
+                      read_package)
+
+TYPE_CHECKING = False  # как typing.TYPE_CHECKING, но без импорта typing
+if TYPE_CHECKING:
+    import argparse
+    from _thread import LockType
+    from typing import (IO, Callable, Iterable, Iterator, List, Optional,
+                        Tuple)
+    from weakref import WeakKeyDictionary
+
+    from cache import ResultCache
+    from dedup import Deduplicator
+    from metrics import Metrics
+    from profiles import Profile
+    from validation import Rejected
+
+    Package = Tuple[str, list]
+else:
+    Package = tuple  # (код тренировки, данные датчиков)
+
+METRICS_ENV_VAR: str = 'FITNESS_METRICS'  # metrics.ENV_VAR без импорта metrics
+
+CHUNK_SIZE: int = 1000  # сколько сообщений записывать за один вызов write
+
+# блокировки записи в общие sink для process_into: sink -> блокировка
+# (WeakKeyDictionary, создаётся при первой записи ради быстрого старта)
+_SINK_LOCKS: Optional[WeakKeyDictionary] = None
+_SINK_LOCKS_GUARD = _thread.allocate_lock()
+
+
+def _number(text: str):
+    """Преобразовать текстовое поле в int или float."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Package]:
+    """Разобрать пакеты NDJSON: ["RUN", [...]] или {"workout_type", "data"}."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict):
+            yield record['workout_type'], record['data']
+        else:
+            workout_type, data = record
+            yield workout_type, data
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Package]:
+    """Разобрать пакеты CSV: код тренировки и далее данные датчиков."""
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        yield row[0].strip(), [_number(field) for field in row[1:]]
+
+
+PARSERS = {'ndjson': parse_ndjson, 'csv': parse_csv}
+
+
+def dispatch(packages: Iterable[Package]) -> Iterator[Training]:
+    """Создать объекты тренировок по пакетам."""
+    for workout_type, data in packages:
+        yield read_package(workout_type, data)
+
+
+def compute(trainings: Iterable[Training]) -> Iterator[InfoMessage]:
+    """Рассчитать результаты тренировок."""
+    for training in trainings:
+        yield training.show_training_info()
+
+
+def timed_dispatch(packages: Iterable[Package],
+                   metrics: Metrics) -> Iterator[Training]:
+    """Создать объекты тренировок, замеряя время этапа dispatch."""
+    for workout_type, data in packages:
+        start = perf_counter()
+        training = read_package(workout_type, data)
+        metrics.observe('dispatch', training.__class__.__name__,
+                        perf_counter() - start)
+        yield training
+
+
+def timed_compute(trainings: Iterable[Training],
+                  metrics: Metrics) -> Iterator[InfoMessage]:
+    """Рассчитать результаты, замеряя время этапа compute."""
+    for training in trainings:
+        start = perf_counter()
+        info = training.show_training_info()
+        metrics.observe('compute', info.training_type, perf_counter() - start)
+        yield info
+
+
+def cached_compute(packages: Iterable[Package],
+                   cache: ResultCache) -> Iterator[InfoMessage]:
+    """Получить результаты через кэш, минуя повторные расчёты."""
+    for workout_type, data in packages:
+        yield cache.get_info(workout_type, data)
+
+
+def check_chunk_size(chunk_size: int) -> int:
+    """Проверить размер порции: при нуле и меньше вход пропал бы молча."""
+    if not chunk_size > 0:
+        raise ValueError('Ошибка! Размер порции должен быть положительным.')
+    return chunk_size
+
+
+def write_messages(messages: Iterable[InfoMessage], out: IO[str],
+                   chunk_size: int = CHUNK_SIZE,
+                   metrics: Optional[Metrics] = None) -> int:
+    """Записать сообщения в поток порциями через format_many."""
+    check_chunk_size(chunk_size)
+    messages = iter(messages)
+    total = 0
+    while True:
+        chunk: List[InfoMessage] = list(islice(messages, chunk_size))
+        if not chunk:
+            return total
+        start = perf_counter()
+        text = format_many(chunk) + '\n'
+        formatted = perf_counter()
+        out.write(text)
+        total += len(chunk)
+        if metrics is not None:
+            metrics.observe('format', '', formatted - start)
+            metrics.observe('write', '', perf_counter() - formatted)
+            metrics.increment('messages', '', len(chunk))
+
+
+def render_packages(packages: Iterable[Package],
+                    profile: Optional[Profile] = None) -> str:
+    """Текст сообщений для пакетов одной строкой, без вывода на экран.
+
+    Функция реентерабельна: не использует общего изменяемого состояния,
+    поэтому её можно вызывать из нескольких потоков одновременно.
+    С профилем (profiles.Profile) расчёт идёт скомпилированными функциями
+    без объектов тренировок и InfoMessage на каждый пакет; без профиля —
+    через read_package, с текущими константами и реестром классов.
+    """
+    if profile is not None:
+        return format_values(profile.values(packages))
+    return format_many(read_package(workout_type, data).show_training_info()
+                       for workout_type, data in packages)
+
+
+def _sink_lock(sink) -> LockType:
+    """Общая для всех потоков блокировка записи в sink."""
+    global _SINK_LOCKS
+    with _SINK_LOCKS_GUARD:
+        if _SINK_LOCKS is None:
+            from weakref import WeakKeyDictionary
+
+            _SINK_LOCKS = WeakKeyDictionary()
+        lock = _SINK_LOCKS.get(sink)
+        if lock is None:
+            lock = _SINK_LOCKS[sink] = _thread.allocate_lock()
+        return lock
+
+
+def _chunk_writer(sink) -> Callable[[str], object]:
+    """Функция записи порции текста в sink одним вызовом."""
+    if isinstance(sink, bytearray):
+        return lambda text: sink.extend(text.encode('utf-8'))
+    # TextIOWrapper без блокировки теряет данные при записи из нескольких
+    # потоков; запись через сам sink сохраняет его кодировку (BOM один
+    # раз), errors и перевод концов строк
+    lock = _sink_lock(sink)
+
+    def write(text: str) -> None:
+        with lock:
+            sink.write(text)
+    return write
+
+
+def process_into(packages: Iterable[Package], sink,
+                 chunk_size: int = CHUNK_SIZE,
+                 profile: Optional[Profile] = None) -> int:
+    """Записать сообщения в sink: одна запись на порцию пакетов.
+
+    sink — bytearray или объект с методом write(str): текстовый файл из
+    open(), StringIO. Sink можно разделять между потоками: запись в него
+    из process_into идёт под общей блокировкой, поэтому строки разных
+    порций не теряются и не перемешиваются.
+    """
+    check_chunk_size(chunk_size)
+    write = _chunk_writer(sink)
+    packages = iter(packages)
+    total = 0
+    while True:
+        chunk = list(islice(packages, chunk_size))
+        if not chunk:
+            return total
+        write(render_packages(chunk, profile) + '\n')
+        total += len(chunk)
+
+
+def _compute_stage(cache: Optional[ResultCache], metrics: Optional[Metrics]
+                   ) -> Callable[[Iterable[Package]], Iterator[InfoMessage]]:
+    """Этап расчёта: через кэш, с замером времени или обычный."""
+    if cache is not None:
+        return lambda packages: cached_compute(packages, cache)
+    if metrics is None:
+        return lambda packages: compute(dispatch(packages))
+    return lambda packages: timed_compute(timed_dispatch(packages, metrics),
+                                          metrics)
+
+
+def shared_metrics() -> Optional[Metrics]:
+    """Общий реестр metrics.METRICS, если сбор включён, иначе None.
+
+    Модуль metrics не загружается, если его ещё никто не импортировал
+    и сбор не включён переменной окружения.
+    """
+    if 'metrics' not in sys.modules and not os.environ.get(METRICS_ENV_VAR):
+        return None
+    from metrics import METRICS
+    return METRICS if METRICS.enabled else None
+
+
+def process(lines: Iterable[str], out: IO[str], fmt: str = 'ndjson',
+            chunk_size: int = CHUNK_SIZE,
+            metrics: Optional[Metrics] = None,
+            cache: Optional[ResultCache] = None,
+            reject: Optional[Callable[[Rejected], None]] = None,
+            dedup: Optional[Deduplicator] = None) -> int:
+    """Полный конвейер: разбор, диспетчеризация, расчёт, вывод.
+
+    Если передан reject, строки проверяются заранее, а переполнения при
+    расчёте перехватываются: ошибочные пакеты уходят в reject и не
+    прерывают обработку. Если передан dedup, повторно присланные пакеты
+    отбрасываются до расчёта. Без metrics используется shared_metrics().
+    """
+    if reject is None:
+        packages = PARSERS[fmt](lines)
+    else:
+        from validation import filter_valid, safe_parse
+
+        packages = filter_valid(safe_parse(PARSERS[fmt], lines, reject),
+                                reject)
+    if dedup is not None:
+        packages = dedup.filter(packages)
+    if metrics is None:
+        metrics = shared_metrics()
+    timed = metrics if metrics is not None and metrics.enabled else None
+    stage = _compute_stage(cache, timed)
+    if reject is None:
+        messages = stage(packages)
+    else:
+        from validation import safe_compute
+
+        messages = safe_compute(packages, stage, reject)
+    return write_messages(messages, out, chunk_size, timed)
+
+
+def guess_format(path: str) -> str:
+    """Определить формат входных данных по расширению файла."""
+    return 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path', nargs='?', default='-',
+                        help='файл с пакетами или "-" для stdin')
+    parser.add_argument('--format', choices=sorted(PARSERS),
+                        help='формат входных данных')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='собрать метрики и сохранить их (.prom или JSON)')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='кэшировать результаты повторяющихся пакетов')
+    parser.add_argument('--dead-letter', metavar='PATH',
+                        help='проверять пакеты и писать отбракованные в файл')
+    parser.add_argument('--dedup-window', type=int, default=0,
+                        help='отбрасывать повторы среди N последних пакетов')
+    parser.add_argument('--dedup-bloom', type=int, default=0,
+                        metavar='CAPACITY',
+                        help='отбрасывать повторы фильтром Блума на N пакетов')
+    parser.add_argument('--dedup-error', type=float, default=0.001,
+                        help='доля ложных срабатываний фильтра Блума')
+    parser.add_argument('--dedup-max-bytes', type=int, default=None,
+                        help='ограничение памяти фильтра Блума')
+    args = parser.parse_args(argv)
+    if not args.chunk_size > 0:
+        parser.error('--chunk-size должен быть положительным')
+    if args.metrics:
+        from metrics import METRICS
+
+        METRICS.enable()
+    dedup = _make_dedup(args)
+    if args.dead_letter:
+        from validation import DeadLetter
+
+        with open(args.dead_letter, 'w', encoding='utf-8') as rejects:
+            dead_letter = DeadLetter(rejects)
+            total = _run(args, dead_letter, dedup)
+        print('Отбраковано пакетов: %d %s' % (
+            dead_letter.total, dead_letter.counts), file=sys.stderr)
+    else:
+        total = _run(args, dedup=dedup)
+    if dedup is not None:
+        print('Отброшено повторов: %(dropped)d из %(seen)d'
+              % dedup.stats(), file=sys.stderr)
+    if args.metrics:
+        METRICS.dump(args.metrics)
+    return total
+
+
+def _make_dedup(args: argparse.Namespace) -> Optional[Deduplicator]:
+    """Этап отбрасывания повторов по аргументам командной строки."""
+    if not (args.dedup_bloom or args.dedup_window):
+        return None
+    from dedup import BloomFilter, Deduplicator, WindowIndex
+
+    if args.dedup_bloom:
+        return Deduplicator(BloomFilter(args.dedup_bloom, args.dedup_error,
+                                        args.dedup_max_bytes))
+    return Deduplicator(WindowIndex(args.dedup_window))
+
+
+def _run(args: argparse.Namespace,
+         reject: Optional[Callable[[Rejected], None]] = None,
+         dedup: Optional[Deduplicator] = None) -> int:
+    """Обработать вход, указанный в аргументах командной строки."""
+    fmt = args.format or guess_format(args.path)
+    cache = None
+    if args.cache_size:
+        from cache import ResultCache
+
+        cache = ResultCache(args.cache_size)
+    if args.path == '-':
+        return process(sys.stdin, sys.stdout, fmt, args.chunk_size,
+                       cache=cache, reject=reject, dedup=dedup)
+    with open(args.path, encoding='utf-8', newline='') as lines:
+        return process(lines, sys.stdout, fmt, args.chunk_size,
+                       cache=cache, reject=reject, dedup=dedup)
+
+
+if __name__ == '__main__':
+    run()
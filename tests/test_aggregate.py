@@ -0,0 +1,58 @@
+import json
+import statistics
+
+import pytest
+
+import aggregate
+import homework
+
+PACKAGES = [
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [9000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [4200, 0.5, 70]),
+]
+
+MESSAGES = [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+RUNS = [info for info in MESSAGES if info.training_type == 'Running']
+
+
+def test_totals():
+    aggregator = aggregate.Aggregator()
+    aggregator.update(MESSAGES, athlete='ivan')
+    totals = aggregator.totals('ivan', 'Running')
+    speeds = [info.speed for info in RUNS]
+    assert totals['sessions'] == 4
+    assert totals['distance'] == pytest.approx(
+        sum(info.distance for info in RUNS))
+    assert totals['mean_speed'] == pytest.approx(statistics.mean(speeds))
+    assert totals['speed_variance'] == pytest.approx(
+        statistics.variance(speeds))
+    assert aggregator.keys() == [('ivan', 'Running'), ('ivan', 'Swimming')]
+
+
+def test_merge_equals_single_pass():
+    single = aggregate.Aggregator()
+    single.update(MESSAGES)
+    left, right = aggregate.Aggregator(), aggregate.Aggregator()
+    left.update(MESSAGES[:2])
+    right.update(MESSAGES[2:])
+    left.merge(right)
+    for key in single.keys():
+        expected = single.totals(*key)
+        for name, value in left.totals(*key).items():
+            assert value == pytest.approx(expected[name]), (
+                'Объединение частичных итогов должно давать тот же результат.'
+            )
+
+
+def test_snapshot_restore():
+    aggregator = aggregate.Aggregator()
+    aggregator.update(MESSAGES, athlete='ivan')
+    snapshot = json.loads(json.dumps(aggregator.snapshot()))
+    restored = aggregate.Aggregator.restore(snapshot)
+    assert restored.snapshot() == aggregator.snapshot()
+    restored.add(MESSAGES[0], athlete='ivan')
+    assert restored.totals('ivan', 'Running')['sessions'] == 5
@@ -0,0 +1,69 @@
+import pytest
+
+import batch
+import homework
+
+ROWS = {
+    'SWM': [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4], [1206, 12, 6, 12, 6]],
+    'RUN': [[15000, 1, 75], [420, 4, 20], [1206, 12, 6]],
+    'WLK': [[9000, 1, 75, 180], [420, 4, 20, 42], [1206, 12, 6, 12]],
+}
+
+
+@pytest.mark.parametrize('workout_type', ['SWM', 'RUN', 'WLK'])
+def test_calculate_batch_matches_classes(workout_type):
+    rows = ROWS[workout_type]
+    columns = batch.columns_from_rows(workout_type, rows)
+    result = batch.calculate_batch(workout_type, columns)
+    for i, data in enumerate(rows):
+        training = homework.read_package(workout_type, data)
+        assert result['distance'][i] == training.get_distance(), (
+            'Пакетный расчёт дистанции должен совпадать с классом.'
+        )
+        assert result['speed'][i] == training.get_mean_speed(), (
+            'Пакетный расчёт скорости должен совпадать с классом.'
+        )
+        assert result['calories'][i] == training.get_spent_calories(), (
+            'Пакетный расчёт калорий должен совпадать с классом.'
+        )
+
+
+def test_calculate_batch_messages():
+    rows = ROWS['WLK']
+    result = batch.calculate_batch(
+        'WLK', batch.columns_from_rows('WLK', rows))
+    messages = [m.get_message()
+                for m in batch.iter_info_messages('WLK', result)]
+    expected = [homework.read_package('WLK', data)
+                .show_training_info().get_message() for data in rows]
+    assert messages == expected
+
+
+def test_calculate_batch_unknown_type():
+    with pytest.raises(KeyError):
+        batch.calculate_batch('XXX', {})
+
+
+@pytest.mark.parametrize('workout_type', ['SWM', 'RUN', 'WLK'])
+def test_training_batch(workout_type):
+    rows = ROWS[workout_type]
+    container = batch.TrainingBatch(workout_type, rows)
+    assert len(container) == len(rows)
+    expected = [homework.read_package(workout_type, data)
+                .show_training_info().get_message() for data in rows]
+    assert [container.show_training_info(i).get_message()
+            for i in range(len(rows))] == expected
+    assert [m.get_message()
+            for m in container.iter_info_messages()] == expected
+
+
+def test_training_batch_wrong_arity():
+    with pytest.raises(ValueError):
+        batch.TrainingBatch('RUN').append([1, 2])
+
+
+def test_info_message_has_no_dict():
+    info = homework.InfoMessage('Running', 1, 2, 3, 4)
+    assert not hasattr(info, '__dict__'), (
+        '`InfoMessage` должен хранить поля в `__slots__`.'
+    )
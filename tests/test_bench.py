@@ -0,0 +1,26 @@
+import pytest
+
+import bench
+
+
+@pytest.mark.parametrize('q, expected', [
+    (50, 5), (90, 9), (95, 10), (99, 10), (100, 10), (1, 1), (0, 1),
+])
+def test_percentile_nearest_rank(q, expected):
+    assert bench.percentile(range(1, 11), q) == expected
+
+
+def test_measure_samples_every_operation():
+    stats = bench.measure(bench.BENCHMARKS['read_package'], 300, batch=100,
+                          samples=200)
+    assert stats['operations'] == 300
+    assert stats['samples'] == 200, (
+        'Перцентили должны считаться по отдельным операциям, '
+        'а не по средним порций.'
+    )
+    assert stats['p50_ns'] <= stats['p95_ns'] <= stats['p99_ns']
+
+
+def test_peak_memory_grows_with_size():
+    factory = bench.BENCHMARKS['show_training_info']
+    assert bench.peak_memory(factory, 3000) > bench.peak_memory(factory, 30)
@@ -0,0 +1,65 @@
+from io import StringIO
+
+import pytest
+
+import cache
+import homework
+import stream
+
+
+def test_cache_hits_and_misses():
+    results = cache.ResultCache(maxsize=10)
+    first = results.get_info('RUN', [15000, 1, 75])
+    second = results.get_info('RUN', [15000, 1, 75])
+    assert first is second, 'Повторный пакет должен браться из кэша.'
+    assert first.get_message() == homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info().get_message()
+    stats = results.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    results = cache.ResultCache(maxsize=2)
+    results.get_info('RUN', [1000, 1, 75])
+    results.get_info('RUN', [2000, 1, 75])
+    results.get_info('RUN', [1000, 1, 75])
+    results.get_info('RUN', [3000, 1, 75])
+    assert len(results) == 2
+    assert results.stats()['evictions'] == 1
+    results.get_info('RUN', [1000, 1, 75])
+    assert results.stats()['hits'] == 2
+
+
+def test_cache_ttl():
+    now = [0.0]
+    results = cache.ResultCache(ttl=10, clock=lambda: now[0])
+    results.get_info('WLK', [9000, 1, 75, 180])
+    now[0] = 11.0
+    results.get_info('WLK', [9000, 1, 75, 180])
+    assert results.stats()['expired'] == 1
+    assert results.stats()['hits'] == 0
+
+
+def test_cache_detects_coefficient_change(monkeypatch):
+    results = cache.ResultCache()
+    before = results.get_info('RUN', [15000, 1, 75])
+    monkeypatch.setattr(homework.Running, 'COEFF_CALOR_RUN_1', 20)
+    after = results.get_info('RUN', [15000, 1, 75])
+    assert after.calories != before.calories, (
+        'После изменения коэффициентов результат должен пересчитываться.'
+    )
+    assert results.stats()['stale'] == 1
+
+
+def test_cache_rejects_bad_size():
+    with pytest.raises(ValueError):
+        cache.ResultCache(maxsize=0)
+
+
+def test_process_with_cache():
+    lines = ['RUN,15000,1,75\n'] * 3
+    results = cache.ResultCache()
+    out = StringIO()
+    stream.process(lines, out, 'csv', cache=results)
+    assert len(out.getvalue().splitlines()) == 3
+    assert results.stats()['hits'] == 2
@@ -0,0 +1,27 @@
+import cli
+
+
+def test_process_command(tmp_path, capsys):
+    path = tmp_path / 'packages.csv'
+    path.write_text('RUN,15000,1,75\n', encoding='utf-8')
+    assert cli.main(['process', str(path)]) == 0
+    assert capsys.readouterr().out.startswith('Тип тренировки: Running;')
+
+
+def test_unknown_command(capsys):
+    assert cli.main(['nope']) == 2
+    assert 'usage: fitness-tracker' in capsys.readouterr().err
+
+
+def test_cold_start_imports():
+    # время импорта не проверяется: на загруженной машине оно нестабильно,
+    # бюджет проверяет команда `fitness-tracker importtime`
+    modules = cli.measure_import('stream')['modules']
+    heavy = [name for name in cli.HEAVY_MODULES if name in modules]
+    assert not heavy, (
+        'Команда process не должна импортировать тяжёлые модули: %s' % heavy
+    )
+    lazy = [name for name in cli.LAZY_MODULES if name in modules]
+    assert not lazy, (
+        'Модули необязательных этапов должны загружаться по флагам: %s' % lazy
+    )
@@ -0,0 +1,53 @@
+import batch
+import columnar
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+MESSAGES = [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'results.ftcol'
+    with open(path, 'wb') as out:
+        assert columnar.write_messages(out, MESSAGES, batch_size=3) == 4
+    restored = list(columnar.iter_messages(str(path)))
+    assert restored == MESSAGES, (
+        'Колоночный файл должен восстанавливать результаты без потерь.'
+    )
+    columns = columnar.read_columns(str(path))
+    assert columns['training_type'].tolist() == [
+        'Swimming', 'Running', 'SportsWalking', 'Running']
+
+
+def test_dictionary_written_once(tmp_path):
+    path = tmp_path / 'results.ftcol'
+    with open(path, 'wb') as out:
+        columnar.write_messages(out, MESSAGES * 10, batch_size=4)
+    data = path.read_bytes()
+    assert data.count('Running'.encode('utf-8')) == 1, (
+        'Название типа тренировки должно храниться в словаре один раз.'
+    )
+
+
+def test_write_batch_result(tmp_path):
+    rows = [[15000, 1, 75], [1206, 12, 6]]
+    result = batch.calculate_batch('RUN', batch.columns_from_rows('RUN', rows))
+    path = tmp_path / 'results.ftcol'
+    with open(path, 'wb') as out:
+        columnar.ColumnWriter(out).write_columns(['Running'] * 2, result)
+    columns = columnar.read_columns(str(path))
+    assert columns['calories'].tolist() == result['calories'].tolist()
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'results.ftcol'
+    with open(path, 'wb') as out:
+        columnar.write_messages(out, [])
+    assert len(columnar.read_columns(str(path))['speed']) == 0
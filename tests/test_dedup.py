@@ -0,0 +1,52 @@
+from io import StringIO
+
+import pytest
+
+import dedup
+import stream
+
+
+def test_package_key_normalizes_numbers():
+    assert dedup.package_key('RUN', [720, 1, 80]) == dedup.package_key(
+        'RUN', [720.0, 1.0, 80.0])
+    assert dedup.package_key('RUN', [720, 1, 80]) != dedup.package_key(
+        'WLK', [720, 1, 80])
+    assert len(dedup.package_key('RUN', [720, 1, 80])) == 16
+
+
+def test_window_index_forgets_old_keys():
+    index = dedup.WindowIndex(window=2)
+    assert not index.add(b'a')
+    assert not index.add(b'b')
+    assert index.add(b'a')
+    assert not index.add(b'c')  # вытесняет b
+    assert len(index) == 2
+    assert not index.add(b'b')
+
+
+def test_bloom_filter_error_rate():
+    bloom = dedup.BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(dedup.package_key('RUN', [i, 1, 75]))
+    false_positives = sum(
+        dedup.package_key('WLK', [i, 1, 75, 180]) in bloom
+        for i in range(2000))
+    assert false_positives / 2000 < 0.02, (
+        'Доля ложных срабатываний фильтра Блума превышает заданную.'
+    )
+    assert dedup.package_key('RUN', [5, 1, 75]) in bloom
+    assert bloom.estimated_error_rate() == pytest.approx(0.01, rel=0.2)
+
+
+def test_bloom_filter_memory_cap():
+    with pytest.raises(ValueError):
+        dedup.BloomFilter(capacity=10 ** 6, error_rate=0.001, max_bytes=1024)
+
+
+def test_process_drops_duplicates():
+    lines = ['RUN,15000,1,75\n', 'RUN,15000.0,1,75\n', 'WLK,9000,1,75,180\n',
+             'RUN,15000,1,75\n']
+    stage = dedup.Deduplicator()
+    out = StringIO()
+    assert stream.process(lines, out, 'csv', dedup=stage) == 2
+    assert stage.stats() == {'seen': 4, 'dropped': 2, 'passed': 2}
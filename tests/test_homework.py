@@ -1,3 +1,4 @@
+import functools
 import re
 import pytest
 import types
@@ -363,3 +364,170 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+def test_format_many():
+    messages = [
+        homework.InfoMessage('Swimming', 1, 75, 1, 80),
+        homework.InfoMessage('Running', 12, 0.7839, 0.065325, -81.320328),
+        homework.InfoMessage('SportsWalking', 1.0, 5.85, 5.85, 157.5),
+    ]
+    result = homework.format_many(messages)
+    assert result == '\n'.join(info.get_message() for info in messages), (
+        'Функция `format_many` должна возвращать тот же текст, '
+        'что и `get_message` для каждого сообщения.'
+    )
+    assert homework.format_many([]) == ''
+
+
+def test_message_template_matches_info_message():
+    info = homework.InfoMessage('Running', 1.23456, 2.5, 3, 100 / 3)
+    assert homework.MESSAGE_TEMPLATE % info._astuple() == (
+        info.get_message()), (
+        'Шаблон `MESSAGE_TEMPLATE` должен совпадать с `InfoMessage.message`.'
+    )
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    for name in ('TRAINING_TYPES', 'TRAINING_FIELDS', 'TRAINING_REQUIRED'):
+        monkeypatch.setattr(homework, name, dict(getattr(homework, name)))
+
+
+def test_register_training(registry):
+
+    @homework.register_training('CYC')
+    class Cycling(homework.Running):
+        LEN_STEP = 5.0
+
+    assert homework.TRAINING_FIELDS['CYC'] == ('action', 'duration', 'weight')
+    result = homework.read_package('CYC', [1000, 1, 75])
+    assert isinstance(result, Cycling), (
+        'Зарегистрированный вид спорта должен обрабатываться `read_package`.'
+    )
+    assert homework.TRAINING_FIELDS['SWM'] == (
+        'action', 'duration', 'weight', 'length_pool', 'count_pool')
+
+
+def test_register_training_defaults(registry):
+    @homework.register_training('CYC')
+    class Cycling(homework.Running):
+        def __init__(self, action, duration, weight=75):
+            super().__init__(action, duration, weight)
+
+    assert homework.read_package('CYC', [1000, 1]).weight == 75, (
+        'Параметры со значением по умолчанию можно не передавать в пакете.'
+    )
+    assert homework.read_package('CYC', [1000, 1, 80]).weight == 80
+    with pytest.raises(ValueError):
+        homework.read_package('CYC', [1000])
+
+
+def test_register_training_wrapped_init(registry):
+    def logged(init):
+        @functools.wraps(init)
+        def wrapper(self, *args):
+            init(self, *args)
+        return wrapper
+
+    @homework.register_training('CYC')
+    class Cycling(homework.Running):
+        @logged
+        def __init__(self, action, duration, weight):
+            super().__init__(action, duration, weight)
+
+    assert homework.TRAINING_FIELDS['CYC'] == ('action', 'duration', 'weight')
+
+
+def test_register_training_rejects_varargs(registry):
+    with pytest.raises(TypeError):
+        @homework.register_training('CYC')
+        class Cycling(homework.Running):
+            def __init__(self, *args):
+                super().__init__(*args)
+    assert 'CYC' not in homework.TRAINING_TYPES
+
+
+def test_register_training_rejects_duplicate(registry):
+    with pytest.raises(ValueError):
+        @homework.register_training('RUN')
+        class Jogging(homework.Running):
+            pass
+    assert homework.TRAINING_TYPES['RUN'] is homework.Running, (
+        'Повторная регистрация кода не должна подменять встроенный класс.'
+    )
+
+
+@pytest.mark.parametrize('input_data', [
+    ('RUN', [15000, 1]),
+    ('WLK', [9000, 1, 75]),
+    ('SWM', [720, 1, 80, 25, 40, 1]),
+])
+def test_read_package_wrong_arity(input_data):
+    with pytest.raises(ValueError):
+        homework.read_package(*input_data)
+
+
+def test_read_package_unknown_type():
+    with pytest.raises(KeyError):
+        homework.read_package('XXX', [1, 1, 1])
+
+
+@pytest.mark.parametrize('input_data, attribute, value', [
+    (['RUN', [15000, 1, 75]], 'action', 9000),
+    (['RUN', [15000, 1, 75]], 'duration', 2),
+    (['WLK', [9000, 1, 75, 180]], 'duration', 0.5),
+    (['SWM', [720, 1, 80, 25, 40]], 'length_pool', 50),
+    (['SWM', [720, 1, 80, 25, 40]], 'count_pool', 10),
+])
+def test_metrics_follow_attribute_changes(input_data, attribute, value):
+    training = homework.read_package(*input_data)
+    training.show_training_info()
+    setattr(training, attribute, value)
+    data = list(input_data[1])
+    fields = homework.TRAINING_FIELDS[input_data[0]]
+    data[fields.index(attribute)] = value
+    fresh = homework.read_package(input_data[0], data)
+    assert training.get_distance() == fresh.get_distance()
+    assert training.get_mean_speed() == fresh.get_mean_speed()
+    assert training.get_spent_calories() == fresh.get_spent_calories(), (
+        'После изменения данных тренировки метрики должны пересчитываться.'
+    )
+
+
+def test_show_training_info_computes_once():
+    calls = []
+
+    class Counting(homework.Running):
+        def get_distance(self):
+            calls.append(1)
+            return super().get_distance()
+
+    training = Counting(15000, 1, 75)
+    info = training.show_training_info()
+    assert len(calls) == 1, 'Дистанция должна рассчитываться один раз.'
+    expected = homework.Running(15000, 1, 75).show_training_info()
+    assert info._astuple()[1:] == expected._astuple()[1:]
+
+
+@pytest.mark.parametrize('base, data', [
+    (homework.Running, [15000, 1, 75]),
+    (homework.SportsWalking, [9000, 1, 75, 180]),
+    (homework.Swimming, [720, 1, 80, 25, 40]),
+])
+def test_show_training_info_uses_overrides(base, data):
+    class Calories(base):
+        def get_spent_calories(self):
+            return 42.0
+
+    class Speed(base):
+        def get_mean_speed(self):
+            return 3.0
+
+    assert Calories(*data).show_training_info().calories == 42.0, (
+        'Переопределённый get_spent_calories должен попадать в сообщение.'
+    )
+    speed = Speed(*data)
+    info = speed.show_training_info()
+    assert info.speed == 3.0
+    assert info.calories == speed.get_spent_calories()
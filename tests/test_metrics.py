@@ -0,0 +1,65 @@
+import json
+from io import StringIO
+
+import metrics
+import stream
+
+LINES = ['["SWM", [720, 1, 80, 25, 40]]\n',
+         '["RUN", [15000, 1, 75]]\n',
+         '["RUN", [15000, 1, 75]]\n']
+
+
+def test_disabled_metrics_collect_nothing():
+    registry = metrics.Metrics(enabled=False)
+    registry.observe('dispatch', 'RUN', 0.5)
+    registry.increment('messages')
+    assert registry.snapshot() == {'stages': [], 'counters': []}
+
+
+def test_env_var_enables_metrics(monkeypatch):
+    monkeypatch.setenv(metrics.ENV_VAR, '1')
+    assert metrics.Metrics().enabled
+    monkeypatch.setenv(metrics.ENV_VAR, '0')
+    assert not metrics.Metrics().enabled
+
+
+def test_process_collects_stage_metrics():
+    registry = metrics.Metrics(enabled=True)
+    stream.process(LINES, StringIO(), metrics=registry)
+    snapshot = json.loads(registry.to_json())
+    counts = {(s['stage'], s['workout_type']): s['count']
+              for s in snapshot['stages']}
+    assert counts[('dispatch', 'Running')] == 2
+    assert counts[('dispatch', 'Swimming')] == 1
+    assert counts[('compute', 'Running')] == 2
+    assert counts[('format', '')] == 1
+    assert snapshot['counters'] == [
+        {'name': 'messages', 'workout_type': '', 'value': 3}]
+
+
+def test_prometheus_format():
+    registry = metrics.Metrics(enabled=True)
+    registry.observe('dispatch', 'RUN', 2e-6)
+    registry.increment('messages', 'RUN', 2)
+    text = registry.to_prometheus()
+    assert ('fitness_stage_seconds_bucket{stage="dispatch",'
+            'workout_type="RUN",le="2.5e-06"} 1') in text
+    assert ('fitness_stage_seconds_count{stage="dispatch",'
+            'workout_type="RUN"} 1') in text
+    assert 'fitness_messages_total{workout_type="RUN"} 2' in text
+
+
+def test_stream_env_var_matches():
+    assert stream.METRICS_ENV_VAR == metrics.ENV_VAR, (
+        'stream проверяет ту же переменную окружения, что и metrics.'
+    )
+
+
+def test_process_uses_shared_metrics(monkeypatch):
+    monkeypatch.setattr(metrics.METRICS, 'enabled', True)
+    metrics.METRICS.reset()
+    stream.process(LINES, StringIO())
+    assert metrics.METRICS.snapshot()['stages'], (
+        'Без явного metrics process должен писать в общий реестр METRICS.'
+    )
+    metrics.METRICS.reset()
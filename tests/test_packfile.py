@@ -0,0 +1,56 @@
+from io import StringIO
+
+import pytest
+
+import homework
+import packfile
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('WLK', [420, 4, 20, 42]),
+    ('SWM', [720.5, 1, 80, 25.5, 40]),
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / 'packages.ftpk'
+    with open(path, 'wb') as out:
+        assert packfile.write_packages(out, PACKAGES, segment_size=1) == 6
+    return str(path)
+
+
+def test_round_trip(path):
+    with packfile.PackageFile(path) as package_file:
+        assert list(package_file.packages()) == PACKAGES
+        types = [workout_type for workout_type, _ in package_file.segments()]
+    assert types == ['SWM', 'RUN', 'RUN', 'WLK', 'WLK', 'SWM']
+
+
+def test_segments_are_zero_copy(path):
+    with packfile.PackageFile(path) as package_file:
+        _, records = next(package_file.segments())
+        assert not records.flags.owndata, (
+            'Сегменты должны читаться из mmap без копирования.'
+        )
+        assert records['length_pool'].tolist() == [25]
+
+
+def test_process_matches_main(path):
+    out = StringIO()
+    assert packfile.process(path, out) == len(PACKAGES)
+    expected = [homework.read_package(*package)
+                .show_training_info().get_message() for package in PACKAGES]
+    assert out.getvalue().splitlines() == expected, (
+        'Дробные значения не должны усекаться при записи в файл.'
+    )
+
+
+def test_bad_magic(tmp_path):
+    path = tmp_path / 'bad.ftpk'
+    path.write_bytes(b'NOPE\x01\x00\x00\x00')
+    with pytest.raises(ValueError):
+        packfile.PackageFile(str(path))
@@ -0,0 +1,38 @@
+from io import StringIO
+
+import pytest
+
+import homework
+import parallel
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+] * 7
+
+
+def test_iter_chunks():
+    chunks = list(parallel.iter_chunks(PACKAGES, 5))
+    assert [len(chunk) for chunk in chunks] == [5, 5, 5, 5, 1]
+    assert sum(chunks, []) == PACKAGES
+
+
+@pytest.mark.parametrize('chunk_size', [0, -5])
+def test_bad_chunk_size(chunk_size):
+    with pytest.raises(ValueError):
+        list(parallel.iter_chunks(PACKAGES, chunk_size))
+    with pytest.raises(ValueError):
+        parallel.write_parallel(PACKAGES, StringIO(), chunk_size)
+    with pytest.raises(SystemExit):
+        parallel.run(['--chunk-size', str(chunk_size), '-'])
+
+
+def test_write_parallel_keeps_order():
+    out = StringIO()
+    parallel.write_parallel(PACKAGES, out, chunk_size=4, max_workers=2)
+    expected = [homework.read_package(*package)
+                .show_training_info().get_message() for package in PACKAGES]
+    assert out.getvalue().splitlines() == expected, (
+        'Параллельная обработка должна сохранять порядок сообщений.'
+    )
@@ -0,0 +1,132 @@
+import json
+
+import pytest
+
+import batch
+import homework
+import profiles
+
+ROWS = {
+    'SWM': [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4], [1206, 12, 6, 12, 6]],
+    'RUN': [[15000, 1, 75], [420, 4, 20], [1206, 12, 6]],
+    'WLK': [[9000, 1, 75, 180], [420, 4, 20, 42], [1206, 12, 6, 12]],
+}
+
+
+def test_rows_cover_registry():
+    assert set(ROWS) == set(homework.TRAINING_TYPES), (
+        'Проверка совпадения расчётов должна охватывать все виды спорта.'
+    )
+    assert set(batch.KERNELS) <= set(homework.TRAINING_TYPES)
+    assert set(profiles.SCALAR_BUILDERS) <= set(homework.TRAINING_TYPES)
+
+
+def _scaled(workout_type):
+    """Все коэффициенты вида спорта, изменённые в 1.25 раза."""
+    cls = homework.TRAINING_TYPES[workout_type]
+    return {name: getattr(cls, name) * 1.25
+            for name in homework.coefficient_names(cls)}
+
+
+@pytest.mark.parametrize('workout_type', sorted(ROWS))
+@pytest.mark.parametrize('scale', [False, True])
+def test_implementations_agree(workout_type, scale):
+    """Классы, batch и профили считают одинаково: формулы не разошлись."""
+    overrides = _scaled(workout_type) if scale else {}
+    base = homework.TRAINING_TYPES[workout_type]
+    reference = type(base.__name__, (base,), overrides)
+    compiled = profiles.Profile('check', {workout_type: overrides})
+    expected = {key: [] for key in ('distance', 'speed', 'calories')}
+    for data in ROWS[workout_type]:
+        training = reference(*data)
+        result = (training.get_distance(), training.get_mean_speed(),
+                  training.get_spent_calories())
+        for key, value in zip(expected, result):
+            expected[key].append(value)
+        assert compiled.scalar(workout_type)(*data) == pytest.approx(
+            result, rel=1e-12), 'Скалярный расчёт профиля расходится.'
+        assert compiled.info(workout_type, data) == (
+            reference(*data).show_training_info())
+    if workout_type not in batch.KERNELS:
+        return
+    columns = batch.columns_from_rows(workout_type, ROWS[workout_type])
+    vectors = [compiled.calculate(workout_type, columns)]
+    if not scale:
+        vectors.append(batch.calculate_batch(workout_type, columns))
+    for vector in vectors:
+        for key, values in expected.items():
+            assert vector[key].tolist() == pytest.approx(
+                values, rel=1e-12), 'Векторный расчёт расходится: ' + key
+
+
+def test_profile_overrides(tmp_path):
+    path = tmp_path / 'profiles.json'
+    path.write_text(json.dumps({'tall': {'RUN': {'LEN_STEP': 0.8}}}),
+                    encoding='utf-8')
+    loaded = profiles.load_profiles(str(path))
+    assert set(loaded) == {'tall', profiles.DEFAULT}
+    distance, _, _ = loaded['tall'].scalar('RUN')(1000, 1, 75)
+    assert distance == 0.8
+    assert homework.Running.LEN_STEP == 0.65, (
+        'Профиль не должен изменять константы классов.'
+    )
+
+
+def test_calculate_by_profile():
+    compiled = profiles.compile_profiles({'tall': {'WLK': {'LEN_STEP': 0.8}}})
+    rows = ROWS['WLK']
+    names = ['tall', 'default', 'tall']
+    result = profiles.calculate_by_profile(
+        'WLK', batch.columns_from_rows('WLK', rows), names, compiled)
+    for i, (data, name) in enumerate(zip(rows, names)):
+        distance, speed, calories = compiled[name].scalar('WLK')(*data)
+        assert result['distance'][i] == distance
+        assert result['calories'][i] == calories
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Копия реестра тренировок, которую тест может дополнять."""
+    for name in ('TRAINING_TYPES', 'TRAINING_FIELDS', 'TRAINING_REQUIRED'):
+        copy = dict(getattr(homework, name))
+        monkeypatch.setattr(homework, name, copy)
+        monkeypatch.setattr(profiles, name, copy)
+
+
+def test_registered_type_uses_generic_kernel(registry):
+    @homework.register_training('CYC')
+    class Cycling(homework.Running):
+        LEN_STEP = 5.0
+
+    compiled = profiles.Profile('fast', {'CYC': {'LEN_STEP': 6.0}})
+    assert compiled.scalar('CYC')(1000, 1, 75)[0] == 6.0
+
+
+def test_info_and_values_accept_same_packages(registry):
+    @homework.register_training('ROW')
+    class Rowing(homework.Running):
+        def __init__(self, duration, action, weight=75):
+            super().__init__(action, duration, weight)
+
+    compiled = profiles.Profile('check', {})
+    for data in ([2, 15000], [2, 15000, 80]):
+        expected = homework.read_package('ROW', data).show_training_info()
+        assert compiled.info('ROW', data) == expected, (
+            'Пакет без необязательных значений должен считаться, '
+            'длительность — браться по имени параметра.'
+        )
+        assert compiled.values([('ROW', data)]) == list(expected._astuple())
+    for data in ([2], [2, 15000, 80, 1]):
+        with pytest.raises(ValueError):
+            compiled.info('ROW', data)
+        with pytest.raises(ValueError):
+            compiled.values([('ROW', data)])
+
+
+@pytest.mark.parametrize('config, error', [
+    ({'bad': {'XXX': {}}}, KeyError),
+    ({'bad': {'RUN': {'NOPE': 1}}}, ValueError),
+])
+def test_bad_profiles(config, error):
+    with pytest.raises(error):
+        profiles.compile_profiles(config)
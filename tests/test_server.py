@@ -0,0 +1,85 @@
+import asyncio
+
+import homework
+import server
+
+
+def test_handle_line():
+    expected = homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info().get_message()
+    assert server.handle_line('["RUN", [15000, 1, 75]]') == expected
+    assert server.handle_line('RUN,15000,1,75') == expected
+    assert server.handle_line('XXX,1,2,3').startswith('Ошибка'), (
+        'Неверный пакет не должен обрывать обработку подключения.'
+    )
+
+
+def test_handle_line_bad_input():
+    assert server.handle_line(b'\xff\xfe,1,2').startswith('Ошибка')
+    assert server.handle_line(
+        '["RUN", [%s, 1, 75]]' % ('9' * 400)).startswith('Ошибка'), (
+        'Переполнение при расчёте не должно обрывать подключение.'
+    )
+
+
+def test_take_lines_limits_line_length():
+    long_line = b'x' * (server.MAX_LINE + 1)
+    lines, tail, skipping = server.take_lines(long_line, False)
+    assert (lines, tail, skipping) == ([long_line], b'', True)
+    lines, tail, skipping = server.take_lines(b'x' * 10, skipping)
+    assert (lines, tail, skipping) == ([], b'', True), (
+        'Остаток слишком длинной строки не должен накапливаться в памяти.'
+    )
+    lines, tail, skipping = server.take_lines(b'xx\nRUN,1,1,1\nWLK', True)
+    assert (lines, tail, skipping) == ([b'RUN,1,1,1'], b'WLK', False)
+
+
+async def _exchange(lines):
+    srv = await server.start(port=0)
+    port = srv.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b''.join(lines))
+    writer.write_eof()
+    answers = (await reader.read()).decode('utf-8').splitlines()
+    writer.close()
+    srv.close()
+    await srv.wait_closed()
+    return answers
+
+
+def test_server_answers_every_line():
+    lines = server.SAMPLE_LINES * 3 + [b'RUN,1,0']
+    answers = asyncio.run(_exchange(lines))
+    assert len(answers) == len(lines)
+    assert answers[:3] == [
+        server.handle_line(line.decode('utf-8'))
+        for line in server.SAMPLE_LINES]
+    assert answers[-1].startswith('Ошибка')
+
+
+def test_bad_lines_keep_connection():
+    lines = [b'\xff\xfe,1,2\n', b'x' * (server.MAX_LINE * 3) + b'\n',
+             b'["RUN", [%s, 1, 75]]\n' % (b'9' * 400),
+             b'[' * 50000 + b'\n'] + server.SAMPLE_LINES
+    answers = asyncio.run(_exchange(lines))
+    assert len(answers) == len(lines), 'На каждую строку — один ответ.'
+    assert answers[1] == server.TOO_LONG
+    assert answers[3].startswith('Ошибка')
+    assert answers[4:] == [server.handle_line(line)
+                           for line in server.SAMPLE_LINES]
+
+
+async def _load():
+    srv = await server.start(port=0)
+    port = srv.sockets[0].getsockname()[1]
+    result = await server.load(port=port, connections=3, requests=50,
+                               window=8)
+    srv.close()
+    await srv.wait_closed()
+    return result
+
+
+def test_load_generator():
+    result = asyncio.run(_load())
+    assert result['requests'] == 150
+    assert result['requests_per_sec'] > 0
@@ -0,0 +1,104 @@
+import json
+import os
+from io import StringIO
+
+import pytest
+
+import aggregate
+import homework
+import shard
+
+RECORDS = [
+    {'athlete': 'anna', 'workout_type': 'RUN', 'data': [15000, 1, 75]},
+    {'athlete': 'ivan', 'workout_type': 'SWM', 'data': [720, 1, 80, 25, 40]},
+    {'athlete': 'oleg', 'workout_type': 'WLK', 'data': [9000, 1, 75, 180]},
+    {'athlete': 'anna', 'workout_type': 'RUN', 'data': [1206, 12, 6]},
+    {'athlete': 'ivan', 'workout_type': 'RUN', 'data': [420, 4, 20]},
+] * 3
+
+
+def expected_messages():
+    return [homework.read_package(r['workout_type'], r['data'])
+            .show_training_info().get_message() for r in RECORDS]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'packages.ndjson'
+    path.write_text(''.join(json.dumps(r) + '\n' for r in RECORDS),
+                    encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('by', ['athlete', 'range'])
+def test_run_sharded(source, tmp_path, by):
+    out = StringIO()
+    total = shard.run_sharded(source, str(tmp_path / 'work'), out,
+                              shards=3, workers=2, by=by)
+    assert out.getvalue().splitlines() == expected_messages(), (
+        'Координатор должен восстанавливать исходный порядок сообщений.'
+    )
+    single = aggregate.Aggregator()
+    for r in RECORDS:
+        single.add(homework.read_package(r['workout_type'], r['data'])
+                   .show_training_info(), r['athlete'])
+    assert total.keys() == single.keys()
+    assert total.totals('anna', 'Running')['sessions'] == 6
+
+
+def test_athlete_stays_in_one_shard(source, tmp_path):
+    workdir = str(tmp_path / 'work')
+    os.makedirs(workdir)
+    with open(source, encoding='utf-8') as lines:
+        shard.partition(lines, workdir, 4)
+    owners = {}
+    for number in range(4):
+        with open(os.path.join(workdir, 'shard-%04d.in' % number),
+                  encoding='utf-8') as lines:
+            for line in lines:
+                athlete = shard.parse_record(line.split('\t', 1)[1])[0]
+                owners.setdefault(athlete, set()).add(number)
+    assert all(len(numbers) == 1 for numbers in owners.values())
+
+
+def test_resume_after_failed_shard(source, tmp_path):
+    workdir = str(tmp_path / 'work')
+    os.makedirs(workdir)
+    with open(source, encoding='utf-8') as lines:
+        shard.partition(lines, workdir, 3, by='range',
+                        identity=shard.source_identity(source))
+    with open(os.path.join(workdir, 'shard-0001.in'), 'a',
+              encoding='utf-8') as broken:
+        broken.write('99\t["XXX", [1, 1, 1]]\n')
+    with pytest.raises(RuntimeError):
+        shard.run_sharded(source, workdir, StringIO(), shards=3, by='range')
+    assert shard.pending_shards(workdir, 3) == [1]
+    with open(os.path.join(workdir, 'shard-0001.in'),
+              encoding='utf-8') as lines:
+        fixed = lines.readlines()[:-1]
+    with open(os.path.join(workdir, 'shard-0001.in'), 'w',
+              encoding='utf-8') as lines:
+        lines.writelines(fixed)
+    out = StringIO()
+    shard.run_sharded(source, workdir, out, shards=3, by='range')
+    assert out.getvalue().splitlines() == expected_messages()
+
+
+@pytest.mark.parametrize('change', [
+    {'shards': 5}, {'by': 'range'}, {'other_source': True},
+    {'rewrite': True},
+])
+def test_resume_rejects_other_run(source, tmp_path, change):
+    workdir = str(tmp_path / 'work')
+    shard.run_sharded(source, workdir, StringIO(), shards=2)
+    path = source
+    if change.pop('other_source', False):
+        path = str(tmp_path / 'other.ndjson')
+        with open(path, 'w', encoding='utf-8') as other:
+            other.write(json.dumps(RECORDS[0]) + '\n')
+    if change.pop('rewrite', False):
+        with open(path, 'a', encoding='utf-8') as grown:
+            grown.write(json.dumps(RECORDS[0]) + '\n')
+    params = dict({'shards': 2}, **change)
+    with pytest.raises(ValueError):
+        shard.run_sharded(path, workdir, StringIO(), **params)
@@ -0,0 +1,125 @@
+import json
+import random
+
+import pytest
+
+import homework
+import sketches
+
+PACKAGES = [
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [9000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+MESSAGES = [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+def exact_rank(values, value):
+    return sum(1 for other in values if other <= value) / len(values)
+
+
+@pytest.mark.parametrize('parts', [1, 4])
+def test_kll_rank_error(parts):
+    generator = random.Random(1)
+    values = [generator.lognormvariate(2, 1) for _ in range(50000)]
+    sketch = sketches.KLLSketch(seed=1)
+    step = len(values) // parts
+    for start in range(0, len(values), step):
+        part = sketches.KLLSketch(seed=start)
+        part.update(values[start:start + step])
+        sketch.merge(part)
+    assert sketch.count == len(values)
+    assert len(sketch) < 3 * sketch.k, 'Память скетча должна быть O(k).'
+    ordered = sorted(values)
+    for q in (0.01, 0.5, 0.95, 0.99):
+        rank = exact_rank(ordered, sketch.quantile(q))
+        assert abs(rank - q) <= sketch.rank_error(), (
+            'Ошибка ранга квантиля должна укладываться в rank_error.'
+        )
+    assert sketch.quantile(0) == ordered[0]
+    assert sketch.quantile(1) == ordered[-1]
+
+
+def test_kll_small_stream_is_exact():
+    sketch = sketches.KLLSketch()
+    sketch.update(range(1, 101))
+    assert sketch.rank_error() == 0.0
+    assert sketch.quantiles([0.5, 0.95]) == [50, 95]
+
+
+def test_kll_snapshot_roundtrip():
+    sketch = sketches.KLLSketch(seed=2)
+    sketch.update(random.Random(2).random() for _ in range(5000))
+    restored = sketches.KLLSketch.restore(
+        json.loads(json.dumps(sketch.snapshot())))
+    assert restored.quantiles([0.5, 0.99]) == sketch.quantiles([0.5, 0.99])
+    assert restored.count == sketch.count
+
+
+@pytest.mark.parametrize('call', [
+    lambda: sketches.KLLSketch().quantile(0.5),
+    lambda: sketches.KLLSketch(k=4),
+    lambda: sketches.KLLSketch(k=16).merge(sketches.KLLSketch(k=32)),
+])
+def test_kll_errors(call):
+    with pytest.raises(ValueError):
+        call()
+
+
+def test_top_k_merge_is_exact():
+    values = list(range(100))
+    random.Random(3).shuffle(values)
+    left, right = sketches.TopK(5), sketches.TopK(5)
+    for value in values[:50]:
+        left.add(value, ('x', value))
+    for value in values[50:]:
+        right.add(value, ('y', value))
+    left.merge(right)
+    assert [value for value, _ in left.items()] == [99, 98, 97, 96, 95]
+
+
+def test_result_stats():
+    left, right = sketches.ResultStats(top=2), sketches.ResultStats(top=2)
+    left.update(MESSAGES[:3])
+    right.update(MESSAGES[3:])
+    left.merge(right)
+    stats = sketches.ResultStats.restore(
+        json.loads(json.dumps(left.snapshot())))
+    speeds = sorted(info.speed for info in MESSAGES[:3])
+    assert stats.percentiles('Running', 'speed', (0.5,)) == {
+        'p50': speeds[1]}
+    heaviest = sorted(MESSAGES, key=lambda info: info.calories)[::-1][:2]
+    assert stats.top() == heaviest, 'Top-N — сессии с наибольшими калориями.'
+    report = stats.report()
+    assert sorted(report['types']) == ['Running', 'SportsWalking', 'Swimming']
+    assert set(report['types']['Running']['calories']) == {
+        'p50', 'p95', 'p99'}
+
+
+def test_run(tmp_path, capsys):
+    path = tmp_path / 'packages.csv'
+    path.write_text('RUN,15000,1,75\nRUN,9000,1,75\n', encoding='utf-8')
+    sketches.run([str(path), '--top', '1'])
+    report = json.loads(capsys.readouterr().out)
+    assert report['types']['Running']['count'] == 2
+    assert len(report['heaviest']) == 1
+
+
+def test_result_stats_seeds_differ():
+    first, second = (sketches.ResultStats(seed=7) for _ in range(2))
+    first.update(MESSAGES)
+    second.update(MESSAGES)
+    draws = [sketch._random.random() for group in first.sketches.values()
+             for sketch in group.values()]
+    assert len(set(draws)) == len(draws) == 6, (
+        'У каждого скетча должно быть своё зерно.'
+    )
+    assert draws == [sketch._random.random()
+                     for group in second.sketches.values()
+                     for sketch in group.values()], (
+        'Одинаковый seed должен давать одинаковые скетчи.'
+    )
@@ -0,0 +1,171 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pytest
+
+import homework
+import profiles
+import stream
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+EXPECTED = [homework.read_package(*package).show_training_info().get_message()
+            for package in PACKAGES]
+
+
+class CountingWriter(StringIO):
+    """Поток, считающий количество вызовов write."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.mark.parametrize('fmt, lines', [
+    ('ndjson', ['["SWM", [720, 1, 80, 25, 40]]\n',
+                '{"workout_type": "RUN", "data": [15000, 1, 75]}\n',
+                '\n',
+                '["WLK", [9000, 1, 75, 180]]\n']),
+    ('csv', ['SWM,720,1,80,25,40\n',
+             'RUN,15000,1,75\n',
+             'WLK,9000,1,75,180\n']),
+])
+def test_process(fmt, lines):
+    out = StringIO()
+    total = stream.process(lines, out, fmt)
+    assert total == len(EXPECTED)
+    assert out.getvalue().splitlines() == EXPECTED, (
+        'Потоковая обработка должна выводить те же сообщения, что и `main`.'
+    )
+
+
+def test_write_messages_buffers_output():
+    out = CountingWriter()
+    messages = [homework.read_package(*package).show_training_info()
+                for package in PACKAGES * 5]
+    assert stream.write_messages(messages, out, chunk_size=4) == 15
+    assert out.writes == 4, 'Сообщения должны записываться порциями.'
+    assert out.getvalue().splitlines() == EXPECTED * 5
+
+
+@pytest.mark.parametrize('chunk_size', [0, -1])
+def test_bad_chunk_size(chunk_size, capsys):
+    with pytest.raises(ValueError):
+        stream.process(['RUN,15000,1,75\n'], StringIO(), 'csv', chunk_size)
+    with pytest.raises(SystemExit):
+        stream.run(['--chunk-size', str(chunk_size), '-'])
+    assert '--chunk-size' in capsys.readouterr().err
+
+
+def test_run_reads_file(tmp_path, capsys):
+    path = tmp_path / 'packages.csv'
+    path.write_text('RUN,15000,1,75\n', encoding='utf-8')
+    stream.run([str(path)])
+    assert capsys.readouterr().out.splitlines() == EXPECTED[1:2]
+
+
+def test_render_packages():
+    assert stream.render_packages(PACKAGES) == '\n'.join(EXPECTED)
+
+
+def test_process_into_bytearray():
+    buffer = bytearray()
+    assert stream.process_into(PACKAGES, buffer) == 3
+    assert buffer.decode('utf-8').splitlines() == EXPECTED
+
+
+def _thread_packages(thread):
+    """Пакеты, строки которых не повторяются ни в этом, ни в других потоках.
+    """
+    return [(workout_type, [data[0] + index, data[1], 60 + thread]
+             + data[3:])
+            for index, (workout_type, data) in enumerate(PACKAGES * 50)]
+
+
+def _read_sink(kind, tmp_path):
+    """Незащищённый блокировкой sink и функция чтения записанного."""
+    if kind == 'bytearray':
+        sink = bytearray()
+        return sink, lambda: sink.decode('utf-8')
+    if kind == 'stringio':
+        sink = StringIO()
+        return sink, sink.getvalue
+    path = tmp_path / 'out.txt'
+    sink = open(path, 'w', encoding='utf-8')
+
+    def read():
+        sink.close()
+        return path.read_text(encoding='utf-8')
+    return sink, read
+
+
+@pytest.mark.parametrize('kind', ['bytearray', 'stringio', 'file'])
+def test_process_into_threads_share_sink(kind, tmp_path):
+    sink, read = _read_sink(kind, tmp_path)
+    packages = [_thread_packages(thread) for thread in range(16)]
+    with ThreadPoolExecutor(8) as executor:
+        totals = list(executor.map(
+            lambda items: stream.process_into(items, sink, chunk_size=30),
+            packages))
+    assert totals == [150] * 16
+    chunks = {}
+    for thread, items in enumerate(packages):
+        for start in range(0, len(items), 30):
+            text = stream.render_packages(items[start:start + 30])
+            chunks[text] = (thread, start)
+    lines = read().splitlines()
+    assert len(lines) == 150 * 16
+    written = [chunks.get('\n'.join(lines[start:start + 30]))
+               for start in range(0, len(lines), 30)]
+    assert None not in written, (
+        'Строки из разных потоков не должны перемешиваться внутри порции.'
+    )
+    for thread in range(16):
+        assert [start for owner, start in written if owner == thread] == [
+            0, 30, 60, 90, 120], 'Порции одного потока идут по порядку.'
+
+
+@pytest.mark.parametrize('encoding', ['utf-8-sig', 'utf-16'])
+def test_process_into_file_keeps_encoding(tmp_path, encoding):
+    path = tmp_path / 'out.txt'
+    with open(path, 'w', encoding=encoding) as sink:
+        assert stream.process_into(PACKAGES * 3, sink, chunk_size=3) == 9
+    assert path.read_text(encoding=encoding).splitlines() == EXPECTED * 3, (
+        'Метка порядка байтов пишется один раз, а не на каждую порцию.'
+    )
+
+
+@pytest.mark.parametrize('chunk_size', [0, -1])
+def test_process_into_bad_chunk_size(chunk_size):
+    with pytest.raises(ValueError):
+        stream.process_into(PACKAGES, bytearray(), chunk_size)
+
+
+def test_render_packages_by_profile():
+    profile = profiles.compile_profiles({})[profiles.DEFAULT]
+    packages = PACKAGES * 10
+    assert stream.render_packages(packages, profile) == (
+        stream.render_packages(packages)
+    )
+    buffer = bytearray()
+    assert stream.process_into(packages, buffer, 4, profile) == 30
+    assert buffer.decode('utf-8').splitlines() == EXPECTED * 10
+    with pytest.raises(ValueError):
+        stream.render_packages([('RUN', [1])], profile)
+
+
+def test_render_packages_threads_are_consistent():
+    packages = PACKAGES * 100
+    expected = stream.render_packages(packages)
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(stream.render_packages,
+                                    [packages] * 32))
+    assert results == [expected] * 32
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+import homework
+import timeseries
+
+
+def test_session_info_matches_package():
+    timestamps = np.arange(1, 3601)
+    counts = np.full(3600, 2.5)
+    series = timeseries.SampleSeries('WLK', timestamps, counts,
+                                     weight=75, height=180)
+    expected = homework.read_package('WLK', [9000, 1, 75, 180])
+    assert series.session_info() == expected.show_training_info(), (
+        'Итог сессии должен совпадать с расчётом по пакету.'
+    )
+
+
+def test_split_by_time():
+    timestamps = np.arange(1, 3601)
+    counts = np.full(3600, 2.5)
+    series = timeseries.SampleSeries('RUN', timestamps, counts, weight=75)
+    result = series.split_by_time(600)
+    assert len(result['distance']) == 6
+    assert result['duration'] == pytest.approx([600 / 3600] * 6)
+    assert result['distance'].sum() == pytest.approx(
+        series.training().get_distance())
+    messages = series.split_messages(result)
+    assert messages[0].training_type == 'Running'
+
+
+def test_split_by_distance():
+    timestamps = np.arange(1, 1001)
+    counts = np.full(1000, 4.0)  # 2.6 м за секунду, 2.6 км всего
+    series = timeseries.SampleSeries('RUN', timestamps, counts, weight=75)
+    result = series.split_by_distance(1.0)
+    assert len(result['distance']) == 3
+    assert result['distance'][0] >= 1.0
+    assert result['distance'].sum() == pytest.approx(2.6)
+
+
+def test_split_pool_lengths():
+    timestamps = np.arange(1, 101)
+    counts = np.full(100, 1.0)  # 1.38 м за гребок, 138 м всего
+    series = timeseries.SampleSeries('SWM', timestamps, counts, weight=80,
+                                     length_pool=25)
+    result = series.split_pool_lengths()
+    assert len(result['distance']) == 6
+    with pytest.raises(ValueError):
+        timeseries.SampleSeries('RUN', [1], [1], weight=75
+                                ).split_pool_lengths()
+
+
+def test_swimming_splits_match_session():
+    timestamps = np.arange(1, 3601)
+    counts = np.full(3600, 1.0)
+    series = timeseries.SampleSeries('SWM', timestamps, counts, weight=80,
+                                     length_pool=25)
+    session = series.session_info()
+    result = series.split_by_time(600)
+    assert result['speed'] == pytest.approx([session.speed] * 6), (
+        'Скорость отрезков и всей сессии должна считаться одинаково.'
+    )
+    assert result['calories'].sum() / 6 == pytest.approx(session.calories)
+
+
+@pytest.mark.parametrize('split, value', [
+    ('split_by_time', 0), ('split_by_time', -60),
+    ('split_by_distance', 0), ('split_by_distance', float('nan')),
+])
+def test_bad_split_size(split, value):
+    series = timeseries.SampleSeries('RUN', [1, 2], [1, 1], weight=75)
+    with pytest.raises(ValueError):
+        getattr(series, split)(value)
+
+
+@pytest.mark.parametrize('timestamps, counts, params', [
+    ([1, 2], [1], {'weight': 75}),
+    ([2, 1], [1, 1], {'weight': 75}),
+    ([1, 2], [1, 1], {}),
+    ([1, 2], [1, 1], {'weight': 75, 'length_pool': 25, 'count_pool': 5}),
+])
+def test_bad_series(timestamps, counts, params):
+    with pytest.raises(ValueError):
+        timeseries.SampleSeries('RUN', timestamps, counts, **params)
@@ -0,0 +1,121 @@
+import json
+from io import StringIO
+
+import numpy as np
+import pytest
+
+import batch
+import homework
+import stream
+import validation
+from cache import ResultCache
+from metrics import Metrics
+
+
+@pytest.mark.parametrize('package, reason', [
+    (('RUN', [15000, 1, 75]), None),
+    (('WLK', [9000, 1.5, 75, 180]), None),
+    (('XXX', [1, 1, 1]), validation.UNKNOWN_TYPE),
+    ((None, [1, 1, 1]), validation.UNKNOWN_TYPE),
+    (('RUN', [15000, 1]), validation.BAD_ARITY),
+    (('RUN', 'abc'), validation.BAD_ARITY),
+    (('RUN', [15000, '1', 75]), validation.NOT_NUMBER),
+    (('RUN', [15000, float('nan'), 75]), validation.NOT_NUMBER),
+    (('RUN', [True, 1, 75]), validation.NOT_NUMBER),
+    (('RUN', [10 ** 400, 1, 75]), validation.NOT_NUMBER),
+    (('RUN', [np.float64(15000), 1, 75]), None),
+    (('RUN', [-1, 1, 75]), validation.NEGATIVE_VALUE),
+    (('RUN', [15000, 0, 75]), validation.NON_POSITIVE_DURATION),
+    (('WLK', [9000, 1, 75, 0]), validation.ZERO_HEIGHT),
+])
+def test_check_package(package, reason):
+    assert validation.check_package(*package) == reason
+
+
+def test_check_package_finds_duration_by_name(monkeypatch):
+    monkeypatch.setitem(homework.TRAINING_FIELDS, 'ROW',
+                        ('duration', 'action', 'weight'))
+    monkeypatch.setitem(homework.TRAINING_REQUIRED, 'ROW', 3)
+    assert validation.check_package('ROW', [1, 0, 75]) is None
+    assert validation.check_package('ROW', [0, 15000, 75]) == (
+        validation.NON_POSITIVE_DURATION)
+
+
+def test_split():
+    good, rejected = validation.split([
+        ('RUN', [15000, 1, 75]), ('SWM', [720, 0, 80, 25, 40])])
+    assert good == [('RUN', [15000, 1, 75])]
+    assert rejected == [validation.Rejected(
+        'SWM', [720, 0, 80, 25, 40], validation.NON_POSITIVE_DURATION)]
+
+
+def test_process_sends_rejects_to_dead_letter():
+    lines = ['RUN,15000,1,75\n', 'RUN,1,0,75\n', 'RUN,a,1,75\n',
+             '["SWM", [720, 1, 80, 25, 40]]\n']
+    rejects = StringIO()
+    dead_letter = validation.DeadLetter(rejects)
+    out = StringIO()
+    assert stream.process(lines, out, 'csv', reject=dead_letter) == 1, (
+        'Ошибочные пакеты не должны прерывать обработку.'
+    )
+    assert dead_letter.counts == {validation.NON_POSITIVE_DURATION: 1,
+                                  validation.MALFORMED: 2}
+    records = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert records[0] == {'workout_type': 'RUN', 'data': [1, 0, 75],
+                          'reason': validation.NON_POSITIVE_DURATION}
+
+
+@pytest.mark.parametrize('fmt, bad', [
+    ('csv', 'RUN,%s,1,75\n' % ('9' * 200000)),
+    ('ndjson', '[' * 50000 + '\n'),
+])
+def test_process_rejects_unparsable_lines(fmt, bad):
+    good = {'csv': 'RUN,15000,1,75\n', 'ndjson': '["RUN", [15000, 1, 75]]\n'}
+    dead_letter = validation.DeadLetter()
+    out = StringIO()
+    total = stream.process([good[fmt], bad, good[fmt]], out, fmt,
+                           reject=dead_letter)
+    assert total == 2, 'Неразборчивая строка не должна прерывать обработку.'
+    assert dead_letter.counts == {validation.MALFORMED: 1}
+
+
+@pytest.mark.parametrize('metrics', [False, True])
+@pytest.mark.parametrize('cache_size', [0, 10])
+def test_process_rejects_arithmetic_errors(metrics, cache_size):
+    packages = [('RUN', [15000, 1, 75]), ('WLK', [1e200, 1, 75, 180]),
+                ('WLK', [9000, 1e-300, 75, 180]), ('SWM', [720, 1, 80, 25, 40])]
+    lines = [json.dumps(package) + '\n' for package in packages]
+    dead_letter = validation.DeadLetter()
+    out = StringIO()
+    cache = ResultCache(cache_size) if cache_size else None
+    registry = Metrics(enabled=metrics)
+    assert stream.process(lines, out, reject=dead_letter, cache=cache,
+                          metrics=registry) == 2, (
+        'Переполнение при расчёте одного пакета не должно прерывать обработку.'
+    )
+    assert dead_letter.counts == {validation.ARITHMETIC: 2}
+    assert out.getvalue().splitlines() == [
+        homework.read_package(*packages[i]).show_training_info().get_message()
+        for i in (0, 3)]
+
+
+def test_run_dead_letter_survives_huge_integer(tmp_path, capsys):
+    source = tmp_path / 'big.ndjson'
+    source.write_text('["RUN", [%s, 1, 75]]\n["RUN", [15000, 1, 75]]\n'
+                      % ('9' * 400), encoding='utf-8')
+    rejects = tmp_path / 'dl.ndjson'
+    assert stream.run([str(source), '--dead-letter', str(rejects)]) == 1
+    record = json.loads(rejects.read_text(encoding='utf-8'))
+    assert record['reason'] == validation.NOT_NUMBER
+    capsys.readouterr()
+
+
+def test_check_columns():
+    rows = [[9000, 1, 75, 180], [9000, 0, 75, 180], [9000, 1, 75, 0],
+            [-5, 1, 75, 180], [9000, np.inf, 75, 180]]
+    reasons = validation.check_columns(
+        'WLK', batch.columns_from_rows('WLK', rows))
+    assert reasons.tolist() == ['', validation.NON_POSITIVE_DURATION,
+                                validation.ZERO_HEIGHT,
+                                validation.NEGATIVE_VALUE,
+                                validation.NOT_NUMBER]
@@ -0,0 +1,115 @@
+"""Тренировки по временным рядам датчиков: отрезки и итог сессии."""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from batch import Columns, calculate_batch, iter_info_messages
+from homework import TRAINING_FIELDS, TRAINING_TYPES, InfoMessage, Training
+
+S_IN_H: int = 3600  # секунд в часе
+# данные пакета, которые вычисляются по отсчётам, а не задаются:
+# count_pool (сколько раз переплыл бассейн) — по гребкам и length_pool
+DERIVED: Tuple[str, ...] = ('count_pool',)
+
+
+class SampleSeries:
+    """Поток отсчётов датчика одной тренировки.
+
+    timestamps — время конца каждого отсчёта в секундах от start,
+    counts — количество действий (шагов/гребков) за этот отсчёт.
+    params — остальные данные пакета: weight, а также height для WLK
+    или length_pool для SWM. count_pool для SWM не задаётся: он считается
+    по гребкам одинаково для всей сессии и для отрезков.
+    """
+
+    def __init__(self, workout_type: str, timestamps: Sequence[float],
+                 counts: Sequence[float], start: float = 0.0,
+                 **params: float) -> None:
+        if workout_type not in TRAINING_TYPES:
+            raise KeyError('Ошибка! Тип тренировки не определен!')
+        derived = set(DERIVED) & set(params)
+        if derived:
+            raise ValueError('Ошибка! Параметры вычисляются по отсчётам: %s.'
+                             % ', '.join(sorted(derived)))
+        missing = (set(TRAINING_FIELDS[workout_type][2:]) - set(DERIVED)
+                   - set(params))
+        if missing:
+            raise ValueError('Ошибка! Не заданы параметры: %s.'
+                             % ', '.join(sorted(missing)))
+        self.workout_type: str = workout_type
+        self.timestamps: np.ndarray = np.asarray(timestamps, dtype=float)
+        self.counts: np.ndarray = np.asarray(counts, dtype=float)
+        if self.timestamps.shape != self.counts.shape:
+            raise ValueError('Ошибка! Длины timestamps и counts различаются.')
+        if not len(self.timestamps) or np.any(
+                np.diff(self.timestamps, prepend=start) <= 0):
+            raise ValueError('Ошибка! Время отсчётов должно возрастать.')
+        self.start: float = start
+        self.params: Dict[str, float] = params
+
+    def _training_class(self):
+        return TRAINING_TYPES[self.workout_type]
+
+    def training(self) -> Training:
+        """Объект тренировки для всей сессии (один отрезок на все отсчёты)."""
+        columns = self._segments(np.array([0]))
+        return self._training_class()(*(
+            float(columns[name][0])
+            for name in TRAINING_FIELDS[self.workout_type]))
+
+    def session_info(self) -> InfoMessage:
+        """Итоговое сообщение за всю сессию."""
+        return self.training().show_training_info()
+
+    def _segments(self, starts: np.ndarray) -> Columns:
+        """Колонки данных для отрезков, начинающихся с отсчётов starts."""
+        durations = np.diff(self.timestamps, prepend=self.start)
+        size = len(starts)
+        columns = {'action': np.add.reduceat(self.counts, starts),
+                   'duration': np.add.reduceat(durations, starts) / S_IN_H}
+        for name in TRAINING_FIELDS[self.workout_type][2:]:
+            if name not in DERIVED:
+                columns[name] = np.full(size, float(self.params[name]))
+        if 'count_pool' in TRAINING_FIELDS[self.workout_type]:
+            cls = self._training_class()
+            columns['count_pool'] = (columns['action'] * cls.LEN_STEP
+                                     / columns['length_pool'])
+        return columns
+
+    def split_by_time(self, seconds: float) -> Columns:
+        """Результаты по отрезкам фиксированной длительности."""
+        if not seconds > 0:
+            raise ValueError('Ошибка! Длительность отрезка должна быть '
+                             'положительной.')
+        elapsed = self.timestamps - self.start
+        index = np.floor((elapsed - 1e-9) / seconds).astype(np.int64)
+        starts = np.flatnonzero(np.diff(index, prepend=-1))
+        return calculate_batch(self.workout_type, self._segments(starts))
+
+    def split_by_distance(self, km: float) -> Columns:
+        """Результаты по отрезкам дистанции (например, по 1 км).
+
+        Границы отрезков проходят по отсчётам: отрезок заканчивается на
+        отсчёте, в котором накопленная дистанция достигла границы.
+        """
+        if not km > 0:
+            raise ValueError('Ошибка! Длина отрезка должна быть '
+                             'положительной.')
+        cls = self._training_class()
+        distance = np.cumsum(self.counts) * cls.LEN_STEP / cls.M_IN_KM
+        before = np.concatenate(([0.0], distance[:-1]))
+        index = np.floor(before / km + 1e-12).astype(np.int64)
+        starts = np.flatnonzero(np.diff(index, prepend=-1))
+        return calculate_batch(self.workout_type, self._segments(starts))
+
+    def split_pool_lengths(self) -> Columns:
+        """Результаты по каждой длине бассейна (только для плавания)."""
+        if 'length_pool' not in self.params:
+            raise ValueError('Ошибка! Отрезки по бассейну только для SWM.')
+        return self.split_by_distance(
+            self.params['length_pool'] / self._training_class().M_IN_KM)
+
+    def split_messages(self, result: Columns) -> List[InfoMessage]:
+        """Сообщения для каждого отрезка."""
+        return list(iter_info_messages(self.workout_type, result))
@@ -0,0 +1,178 @@
+"""Проверка пакетов датчиков до расчёта и отбраковка ошибочных строк."""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from typing import (IO, TYPE_CHECKING, Callable, Dict, Iterable, Iterator,
+                    List, NamedTuple, Optional, Tuple)
+
+from homework import TRAINING_FIELDS, TRAINING_REQUIRED
+
+if TYPE_CHECKING:
+    import numpy as np  # импортируется лениво в check_columns
+
+    from homework import InfoMessage
+
+# коды причин отбраковки
+MALFORMED = 'malformed'                      # строку не удалось разобрать
+UNKNOWN_TYPE = 'unknown_type'                # неизвестный код тренировки
+BAD_ARITY = 'bad_arity'                      # неверное количество значений
+NOT_NUMBER = 'not_number'                    # значение не число или не конечно
+NEGATIVE_VALUE = 'negative_value'            # отрицательное значение
+NON_POSITIVE_DURATION = 'non_positive_duration'  # длительность <= 0
+ZERO_HEIGHT = 'zero_height'                  # рост 0 (деление в SportsWalking)
+ARITHMETIC = 'arithmetic'                    # переполнение при расчёте
+
+NUMBER_TYPES = (int, float)
+
+
+class Rejected(NamedTuple):
+    """Отбракованный пакет и причина."""
+    workout_type: object
+    data: object
+    reason: str
+
+
+def _field(fields: Tuple[str, ...], data: list, name: str) -> object:
+    """Значение параметра name в пакете или None, если его нет в данных."""
+    if name in fields[:len(data)]:
+        return data[fields.index(name)]
+    return None
+
+
+def _check_values(fields: Tuple[str, ...], data: list) -> Optional[str]:
+    """Проверки значений пакета известного типа и верной длины."""
+    for value in data:
+        if not isinstance(value, NUMBER_TYPES) or isinstance(value, bool):
+            return NOT_NUMBER
+        try:
+            if not math.isfinite(value):
+                return NOT_NUMBER
+        except OverflowError:  # целое, не представимое в float
+            return NOT_NUMBER
+    if min(data) < 0:
+        return NEGATIVE_VALUE
+    duration = _field(fields, data, 'duration')
+    if duration is not None and duration <= 0:
+        return NON_POSITIVE_DURATION
+    if _field(fields, data, 'height') == 0:
+        return ZERO_HEIGHT
+    return None
+
+
+def check_package(workout_type: str, data: list) -> Optional[str]:
+    """Вернуть код причины отбраковки или None для корректного пакета."""
+    if not isinstance(workout_type, str):
+        return UNKNOWN_TYPE
+    fields = TRAINING_FIELDS.get(workout_type)
+    if fields is None:
+        return UNKNOWN_TYPE
+    if (not isinstance(data, (list, tuple))
+            or not TRAINING_REQUIRED[workout_type] <= len(data)
+            <= len(fields)):
+        return BAD_ARITY
+    return _check_values(fields, data)
+
+
+def split(packages: Iterable[tuple]) -> Tuple[List[tuple], List[Rejected]]:
+    """Разделить пакеты на корректные и отбракованные."""
+    good: List[tuple] = []
+    rejected: List[Rejected] = []
+    for workout_type, data in packages:
+        reason = check_package(workout_type, data)
+        if reason is None:
+            good.append((workout_type, data))
+        else:
+            rejected.append(Rejected(workout_type, data, reason))
+    return good, rejected
+
+
+def filter_valid(packages: Iterable[tuple],
+                 reject: Callable[[Rejected], None]) -> Iterator[tuple]:
+    """Пропустить дальше только корректные пакеты, прочие — в reject."""
+    for workout_type, data in packages:
+        reason = check_package(workout_type, data)
+        if reason is None:
+            yield workout_type, data
+        else:
+            reject(Rejected(workout_type, data, reason))
+
+
+def safe_parse(parse: Callable[[Iterable[str]], Iterator[tuple]],
+               lines: Iterable[str],
+               reject: Callable[[Rejected], None]) -> Iterator[tuple]:
+    """Разбирать строки по одной; неразборчивые строки — в reject."""
+    for line in lines:
+        try:
+            yield from parse([line])
+        except (ValueError, KeyError, TypeError, csv.Error, RecursionError):
+            # csv.Error — поле длиннее csv.field_size_limit(),
+            # RecursionError — слишком глубокая вложенность JSON
+            reject(Rejected(None, line.rstrip('\n'), MALFORMED))
+
+
+def safe_compute(packages: Iterable[tuple],
+                 stage: Callable[[Iterable[tuple]], Iterator[InfoMessage]],
+                 reject: Callable[[Rejected], None]) -> Iterator[InfoMessage]:
+    """Выполнить этап расчёта stage; пакет с ArithmeticError — в reject.
+
+    Прошедшие проверку значения всё равно могут переполнить float
+    (например, speed ** 2 при огромном action). Этап считает пакеты по
+    одному, поэтому ошибку вызвал последний отданный ему пакет; после
+    неё этап запускается заново на оставшихся пакетах.
+    """
+    packages = iter(packages)
+    last: List[tuple] = []
+
+    def tracked() -> Iterator[tuple]:
+        for package in packages:
+            last[:] = package
+            yield package
+    while True:
+        try:
+            yield from stage(tracked())
+            return
+        except ArithmeticError:
+            reject(Rejected(last[0], last[1], ARITHMETIC))
+
+
+class DeadLetter:
+    """Запись отбракованных пакетов в NDJSON с подсчётом по причинам."""
+
+    def __init__(self, out: Optional[IO[str]] = None) -> None:
+        self._out = out
+        self.counts: Dict[str, int] = {}
+
+    def __call__(self, rejected: Rejected) -> None:
+        self.counts[rejected.reason] = self.counts.get(rejected.reason, 0) + 1
+        if self._out is not None:
+            self._out.write(json.dumps(rejected._asdict(), default=repr,
+                                       ensure_ascii=False) + '\n')
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+def check_columns(workout_type: str,
+                  columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Векторная проверка колонок: массив кодов причин ('' — корректно)."""
+    import numpy as np
+
+    fields = TRAINING_FIELDS[workout_type]
+    values = np.stack([np.asarray(columns[name], dtype=float)
+                       for name in fields])
+    reasons = np.full(values.shape[1], '', dtype=object)
+    checks = [
+        ('height' in fields
+         and values[fields.index('height')] == 0, ZERO_HEIGHT),
+        (values[fields.index('duration')] <= 0, NON_POSITIVE_DURATION),
+        ((values < 0).any(axis=0), NEGATIVE_VALUE),
+        (~np.isfinite(values).all(axis=0), NOT_NUMBER),
+    ]
+    for mask, reason in checks:  # более важные причины записываются позже
+        if mask is not False:
+            reasons[mask] = reason
+    return reasons